@@ -12,7 +12,21 @@ class Settings(BaseSettings):
     
     # 환율 정보 캐시 지속 시간 (초), 기본값 1시간
     CACHE_TTL_SECONDS: int = 3600
+    # 환율 디스크 캐시 경로 (서버 재시작·여러 워커 간에 조회한 환율을 공유)
+    FX_CACHE_DIR: str = ".cache/fx"
+
+    # 종목 기본 정보(yfinance info) 캐시 지속 시간 (초), 기본값 1분
+    INFO_CACHE_TTL_SECONDS: int = 60
+
+    # yfinance 응답 디스크 캐시 경로 및 지속 시간 (초)
+    YFS_CACHE_DIR: str = ".cache/yfinance"
+    YFS_CACHE_MAX_ENTRIES: int = 2048
+    FINANCIALS_CACHE_TTL_SECONDS: int = 86400
+    PRICE_HISTORY_CACHE_TTL_SECONDS: int = 86400
     
+    # Google Cloud Translation API 키 (설정하지 않으면 deep_translator로 번역)
+    GOOGLE_TRANSLATE_API_KEY: str | None = None
+
     # 환율 조회 실패 시 사용할 기본값
     DEFAULT_KRW_RATE: float = 1350.0
 
@@ -1,18 +1,24 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from functools import lru_cache
 from .constants import INCOME_KR, BALANCE_KR, CASHFLOW_KR
+from .formatting_kernels import UNIT_SUFFIXES, classify_matrix
+
+# 금액 단위 분류표 (기준값, 나눗수, 접미사) - 큰 단위부터 검사
+_UNIT_MIN = 1e6
+_UNIT_TABLE = ((1e12, 1e12, "조"), (1e8, 1e8, "억"), (1e6, 1e6, "백만"))
 
 def _classify_unit(value: float) -> tuple[str, float]:
     """금액 단위를 조, 억 등으로 분류"""
-    if abs(value) >= 1_000_000_000_000:
-        return "조", value / 1_000_000_000_000
-    if abs(value) >= 100_000_000:
-        return "억", value / 100_000_000
-    elif abs(value) >= 1_000_000:
-        return "백만", value / 1_000_000
-    else:
-        # 억 미만은 그대로 표시하되, 천 단위 쉼표를 위해 포맷팅에서 처리
+    abs_value = abs(value)
+    # 백만 미만이 가장 흔하므로 먼저 걸러냄 (천 단위 쉼표는 포맷팅에서 처리)
+    if abs_value < _UNIT_MIN:
         return "", value
+    # 마지막 기준값이 _UNIT_MIN과 같으므로 여기까지 온 값은 반드시 한 단위에 해당 (NaN은 호출 측에서 걸러냄)
+    for threshold, divisor, suffix in _UNIT_TABLE:
+        if abs_value >= threshold:
+            return suffix, value / divisor
 
 def _format_usd_bilingual(amount: float, rate: float) -> str:
     """USD 금액을 원화와 병기하여 포맷팅 (미국 주식용)"""
@@ -38,8 +44,14 @@ def _format_krw(amount: float) -> str:
     value_str = f"{krw_value:,.2f}".rstrip('0').rstrip('.')
     return f"₩{value_str}{krw_unit}"
 
+# 같은 종목의 개요·재무 요약은 짧은 간격으로 반복 조회되므로 (금액, 종목, 환율) 단위로 결과를 재사용
+# (환율이 키에 포함되므로 환율이 갱신되면 자연히 새 항목으로 계산됨)
+@lru_cache(maxsize=4096)
 def format_currency(amount: float, symbol: str, rate: float) -> str:
-    """주식 종류(국내/해외)에 따라 통화 포맷팅을 분기"""
+    """주식 종류(국내/해외)에 따라 통화 포맷팅을 분기
+
+    환율(rate)은 엔드포인트 진입 시 get_exchange_rate로 한 번 조회해 전달해야 하며, 포맷팅 중에는 네트워크 조회를 하지 않습니다.
+    """
     if amount is None or pd.isna(amount):
         return "-"
         
@@ -50,6 +62,28 @@ def format_currency(amount: float, symbol: str, rate: float) -> str:
     else:
         return _format_usd_bilingual(amount, rate)
 
+def format_currency_batch(amounts: list, symbol: str, rate: float) -> list[str]:
+    """여러 금액을 한 번에 포맷팅 (format_currency와 같은 결과를 단위 분류만 배열 연산으로 계산)"""
+    values = np.array([np.nan if a is None else a for a in amounts], dtype=np.float64)
+    # None/NaN/0은 format_currency와 마찬가지로 "-"
+    missing = (np.isnan(values) | (values == 0)).tolist()
+
+    if symbol.upper().endswith(('.KS', '.KQ')):
+        units, scaled = classify_matrix(values)
+        return [
+            "-" if miss else f"₩{f'{v:,.2f}'.rstrip('0').rstrip('.')}{UNIT_SUFFIXES[u]}"
+            for miss, v, u in zip(missing, scaled.tolist(), units.tolist())
+        ]
+
+    usd_units, usd_scaled = classify_matrix(values)
+    krw_units, krw_scaled = classify_matrix(values * rate)
+    return [
+        "-" if miss else f"${uv:,.2f}{UNIT_SUFFIXES[uu]} (₩{kv:,.2f}{UNIT_SUFFIXES[ku]})"
+        for miss, uv, uu, kv, ku in zip(
+            missing, usd_scaled.tolist(), usd_units.tolist(), krw_scaled.tolist(), krw_units.tolist()
+        )
+    ]
+
 def format_stock_profile(info: dict, summary_kr: str) -> dict:
     """회사 기본 정보를 API 응답 포맷으로 변환"""
     return {
@@ -65,100 +99,165 @@ def format_stock_profile(info: dict, summary_kr: str) -> dict:
         "fullTimeEmployees": f"{info.get('fullTimeEmployees', 0):,}" if info.get('fullTimeEmployees') else "정보 없음",
     }
 
-def format_financial_summary(info: dict, symbol: str, rate: float) -> dict:
-    """재무 요약 정보를 API 응답 포맷으로 변환"""
+# --- 필드 포맷 명세 테이블 ---
+# 각 항목은 (키, 포맷 종류, 값이 없을 때의 기본값) 형태이며 _apply_spec이 한 번의 루프로 처리합니다.
+(_KIND_RAW, _KIND_UPPER, _KIND_CURRENCY, _KIND_PCT, _KIND_RAW_PCT,
+ _KIND_FLOAT2, _KIND_PRICE, _KIND_USD, _KIND_SHARES, _KIND_DATE) = range(10)
 
-    # ✅ exDividendDate 포매팅 로직
-    ex_dividend_timestamp = info.get('exDividendDate')
-    ex_dividend_date_str = None
-    if ex_dividend_timestamp:
-        # 타임스탬프를 날짜 문자열로 변환
-        ex_dividend_date_str = datetime.fromtimestamp(ex_dividend_timestamp).strftime('%Y-%m-%d')
+_FIN_SUMMARY_SPEC = (
+    ("totalRevenue", _KIND_CURRENCY, None),
+    ("netIncomeToCommon", _KIND_CURRENCY, None),
+    ("operatingMargins", _KIND_PCT, None),
+    ("dividendYield", _KIND_RAW_PCT, None),
+    ("trailingEps", _KIND_FLOAT2, None),
+    ("totalCash", _KIND_CURRENCY, None),
+    ("totalDebt", _KIND_CURRENCY, None),
+    ("debtToEquity", _KIND_FLOAT2, None),
+    ("exDividendDate", _KIND_DATE, None),
+)
 
-    return {
-        "totalRevenue": format_currency(info.get('totalRevenue'), symbol, rate),
-        "netIncomeToCommon": format_currency(info.get('netIncomeToCommon'), symbol, rate),
-        "operatingMargins": f"{info.get('operatingMargins', 0) * 100:.2f}%" if info.get('operatingMargins') is not None else "-",
-        "dividendYield": f"{info.get('dividendYield', 0) }%" if info.get('dividendYield') is not None else "-",
-        "trailingEps": f"{info.get('trailingEps'):.2f}" if info.get('trailingEps') is not None else "-",
-        "totalCash": format_currency(info.get('totalCash'), symbol, rate),
-        "totalDebt": format_currency(info.get('totalDebt'), symbol, rate),
-        "debtToEquity": f"{info.get('debtToEquity'):.2f}" if info.get('debtToEquity') is not None else "-",
-        "exDividendDate": ex_dividend_date_str
-    }
+_METRICS_SPEC = (
+    ("trailingPE", _KIND_FLOAT2, None),
+    ("forwardPE", _KIND_FLOAT2, None),
+    ("priceToBook", _KIND_FLOAT2, None),
+    ("returnOnEquity", _KIND_PCT, None),
+    ("returnOnAssets", _KIND_PCT, None),
+    ("beta", _KIND_FLOAT2, None),
+)
+
+_MARKET_DATA_SPEC = (
+    ("currentPrice", _KIND_PRICE, 0),
+    ("previousClose", _KIND_PRICE, 0),
+    ("dayHigh", _KIND_PRICE, 0),
+    ("dayLow", _KIND_PRICE, 0),
+    ("fiftyTwoWeekHigh", _KIND_PRICE, 0),
+    ("fiftyTwoWeekLow", _KIND_PRICE, 0),
+    ("marketCap", _KIND_CURRENCY, None),
+    ("sharesOutstanding", _KIND_SHARES, 0),
+    ("volume", _KIND_SHARES, 0),
+)
+
+_RECOMMENDATIONS_SPEC = (
+    ("recommendationMean", _KIND_RAW, 0),
+    ("recommendationKey", _KIND_UPPER, 'N/A'),
+    ("numberOfAnalystOpinions", _KIND_RAW, 0),
+    ("targetMeanPrice", _KIND_USD, 0),
+    ("targetHighPrice", _KIND_USD, 0),
+    ("targetLowPrice", _KIND_USD, 0),
+)
+
+def _apply_spec(info: dict, spec: tuple, symbol: str = "", rate: float = 0.0) -> dict:
+    """명세 테이블에 따라 info의 필드들을 한 번의 루프로 포맷팅"""
+    currency_prefix = "₩" if symbol.upper().endswith(('.KS', '.KQ')) else "$"
+    result = {}
+    for key, kind, default in spec:
+        value = info.get(key, default)
+        if kind == _KIND_CURRENCY:
+            result[key] = format_currency(value, symbol, rate)
+        elif kind == _KIND_FLOAT2:
+            result[key] = f"{value:.2f}" if value is not None else "-"
+        elif kind == _KIND_PCT:
+            result[key] = f"{value * 100:.2f}%" if value is not None else "-"
+        elif kind == _KIND_PRICE:
+            result[key] = f"{currency_prefix}{value:,.2f}"
+        elif kind == _KIND_SHARES:
+            result[key] = f"{value:,}주"
+        elif kind == _KIND_USD:
+            result[key] = f"${value:.2f}"
+        elif kind == _KIND_RAW_PCT:
+            result[key] = f"{value}%" if value is not None else "-"
+        elif kind == _KIND_UPPER:
+            result[key] = value.upper()
+        elif kind == _KIND_DATE:
+            # 타임스탬프를 날짜 문자열로 변환
+            result[key] = datetime.fromtimestamp(value).strftime('%Y-%m-%d') if value else None
+        else:
+            result[key] = value
+    return result
+
+def format_financial_summary(info: dict, symbol: str, rate: float) -> dict:
+    """재무 요약 정보를 API 응답 포맷으로 변환"""
+    return _apply_spec(info, _FIN_SUMMARY_SPEC, symbol, rate)
     
 def format_investment_metrics(info: dict) -> dict:
     """투자 지표를 API 응답 포맷으로 변환"""
-    return {
-        "trailingPE": f"{info.get('trailingPE'):.2f}" if info.get('trailingPE') is not None else "-",
-        "forwardPE": f"{info.get('forwardPE'):.2f}" if info.get('forwardPE') is not None else "-",
-        "priceToBook": f"{info.get('priceToBook'):.2f}" if info.get('priceToBook') is not None else "-",
-        "returnOnEquity": f"{info.get('returnOnEquity', 0) * 100:.2f}%" if info.get('returnOnEquity') is not None else "-",
-        "returnOnAssets": f"{info.get('returnOnAssets', 0) * 100:.2f}%" if info.get('returnOnAssets') is not None else "-",
-        "beta": f"{info.get('beta'):.2f}" if info.get('beta') is not None else "-",
-    }
+    return _apply_spec(info, _METRICS_SPEC)
 
 def format_market_data(info: dict, symbol: str, rate: float) -> dict:
     """주가/시장 정보를 API 응답 포맷으로 변환"""
-    is_korean_stock = symbol.upper().endswith(('.KS', '.KQ'))
-    currency_prefix = "₩" if is_korean_stock else "$"
-
-    return {
-        "currentPrice": f"{currency_prefix}{info.get('currentPrice', 0):,.2f}",
-        "previousClose": f"{currency_prefix}{info.get('previousClose', 0):,.2f}",
-        "dayHigh": f"{currency_prefix}{info.get('dayHigh', 0):,.2f}",
-        "dayLow": f"{currency_prefix}{info.get('dayLow', 0):,.2f}",
-        "fiftyTwoWeekHigh": f"{currency_prefix}{info.get('fiftyTwoWeekHigh', 0):,.2f}",
-        "fiftyTwoWeekLow": f"{currency_prefix}{info.get('fiftyTwoWeekLow', 0):,.2f}",
-        "marketCap": format_currency(info.get('marketCap'), symbol, rate),
-        "sharesOutstanding": f"{info.get('sharesOutstanding', 0):,}주",
-        "volume": f"{info.get('volume', 0):,}주",
-    }
+    return _apply_spec(info, _MARKET_DATA_SPEC, symbol, rate)
     
 def format_analyst_recommendations(info: dict) -> dict:
     """분석가 의견을 API 응답 포맷으로 변환"""
-    return {
-        "recommendationMean": info.get('recommendationMean', 0),
-        "recommendationKey": info.get('recommendationKey', 'N/A').upper(),
-        "numberOfAnalystOpinions": info.get('numberOfAnalystOpinions', 0),
-        "targetMeanPrice": f"${info.get('targetMeanPrice', 0):.2f}",
-        "targetHighPrice": f"${info.get('targetHighPrice', 0):.2f}",
-        "targetLowPrice": f"${info.get('targetLowPrice', 0):.2f}",
-    }
+    return _apply_spec(info, _RECOMMENDATIONS_SPEC)
+
+def _format_statement_cell(value: float, unit_code: int, currency_prefix: str) -> str:
+    """재무제표 셀 하나를 포맷팅 (재무제표는 정수로 표현)"""
+    # 미리 바인딩한 str.format보다 f-string이 CPython 3.11+에서 더 빠르므로 f-string을 유지
+    return f"{currency_prefix}{'-' if value < 0 else ''}{abs(value):,.0f}{UNIT_SUFFIXES[unit_code]}"
+
+# 재무제표 유형별 (원문 항목, 한국어 항목) 쌍 - 호출마다 매핑 dict를 다시 만들지 않도록 미리 계산
+_STATEMENT_ITEMS = {
+    t: tuple(m.items())
+    for t, m in (("income", INCOME_KR), ("balance", BALANCE_KR), ("cashflow", CASHFLOW_KR))
+}
 
 def format_financial_statement_response(df_raw: pd.DataFrame, statement_type: str, symbol: str) -> dict:
     """재무제표를 API 응답 포맷으로 변환 (한국 주식 처리 추가)"""
-    trans_map = {"income": INCOME_KR, "balance": BALANCE_KR, "cashflow": CASHFLOW_KR}.get(statement_type, {})
     is_korean_stock = symbol.upper().endswith(('.KS', '.KQ'))
     currency_prefix = "₩" if is_korean_stock else "$"
 
+    # 연도 문자열은 컬럼 수만큼만 한 번 생성해 응답 헤더와 각 셀 키에 재사용
     years = [str(y.year) for y in df_raw.columns]
-    formatted_rows = []
-    
-    for k, v in trans_map.items():
-        if k in df_raw.index:
-            row_data = {"item": v}
-            for col in df_raw.columns:
-                val = df_raw.loc[k, col]
-                if pd.notnull(val):
-                    unit, value = _classify_unit(abs(val))
-                    value_str = f"{value:,.0f}" # 재무제표는 정수로 표현
-                    formatted = f"{currency_prefix}{'-' if val < 0 else ''}{value_str}{unit}"
-                    row_data[str(col.year)] = formatted
-                else:
-                    row_data[str(col.year)] = '-'
-            formatted_rows.append(row_data)
+
+    # 존재하는 항목만 골라 숫자 행렬로 한 번에 변환한 뒤 단위를 일괄 분류
+    items = [(k, v) for k, v in _STATEMENT_ITEMS.get(statement_type, ()) if k in df_raw.index]
+    if not items:
+        return {"years": years, "data": []}
+    # .loc 대신 위치 인덱스로 원본 2차원 배열에서 직접 행을 추출 (팬시 인덱싱 결과는 연속 배열)
+    row_idx = df_raw.index.get_indexer([k for k, _ in items])
+    vals = df_raw.to_numpy(dtype=np.float64)[row_idx]
+    units, scaled = classify_matrix(vals)
+    # 셀마다 NumPy 스칼라를 꺼내지 않도록 결측 마스크/단위/값을 한 번에 파이썬 리스트로 변환
+    nan_rows = np.isnan(vals).tolist()
+    unit_rows = units.tolist()
+    scaled_rows = scaled.tolist()
+
+    # 행/셀을 append 루프 대신 컴프리헨션으로 한 번에 생성
+    formatted_rows = [
+        {"item": label, **{
+            year: '-' if is_nan else _format_statement_cell(value, unit_code, currency_prefix)
+            for year, is_nan, value, unit_code in zip(years, nan_row, scaled_row, unit_row)
+        }}
+        for (_, label), nan_row, scaled_row, unit_row in zip(items, nan_rows, scaled_rows, unit_rows)
+    ]
             
     return {"years": years, "data": formatted_rows}
 
-def process_price_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    """주가 데이터프레임을 API 응답에 맞게 처리"""
+_PRICE_COLUMNS = ("Close", "High", "Low", "Open", "Volume")
+
+def price_history_records(df: pd.DataFrame) -> list[dict]:
+    """주가 데이터프레임을 API 응답 행(dict) 리스트로 변환
+
+    reset_index나 열 선택으로 중간 DataFrame을 만들지 않고, 필요한 열만 NumPy 배열로 꺼내 한 번에 조립합니다.
+    """
     if df.empty:
-        return pd.DataFrame()
-    
-    df = df.reset_index()
-    df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
-    df["Date"] = pd.to_datetime(df["Date"]).dt.strftime("%Y-%m-%d")
-    
-    final_cols = ["Date", "Close", "High", "Low", "Open", "Volume"]
-    return df[[c for c in final_cols if c in df.columns]]
\ No newline at end of file
+        return []
+
+    # yfinance는 단일 종목도 (항목, 티커) MultiIndex 열을 반환하므로 첫 레벨 이름으로 위치를 찾음
+    names = df.columns.get_level_values(0) if isinstance(df.columns, pd.MultiIndex) else df.columns
+    positions: dict = {}
+    for i, name in enumerate(names):
+        positions.setdefault(name, i)
+
+    dates = df.iloc[:, positions["Date"]] if "Date" in positions else df.index
+    # 행 단위 strftime 대신 NumPy에서 한 번에 날짜 문자열로 변환
+    cols = {"Date": np.datetime_as_string(pd.to_datetime(dates).to_numpy(dtype="datetime64[D]"), unit="D").tolist()}
+    for name in _PRICE_COLUMNS:
+        if name in positions:
+            values = df.iloc[:, positions[name]].to_numpy(dtype=np.float64)
+            if name == "Volume":
+                # 응답 스키마(PriceHistoryData)대로 거래량은 정수로 맞춤 (결측은 거래 없음으로 보고 0)
+                values = np.nan_to_num(values, nan=0.0).astype(np.int64)
+            cols[name] = values.tolist()
+    return [dict(zip(cols.keys(), row)) for row in zip(*cols.values())]
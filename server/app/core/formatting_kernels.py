@@ -0,0 +1,19 @@
+import numpy as np
+
+# 단위 코드별 접미사와 나눗수 (0: 없음, 1: 백만, 2: 억, 3: 조)
+UNIT_SUFFIXES = ("", "백만", "억", "조")
+_UNIT_DIVISORS = np.array([1.0, 1_000_000.0, 100_000_000.0, 1_000_000_000_000.0])
+# 단위 코드가 바뀌는 경계값 (이 값 이상이면 다음 단위)
+_UNIT_THRESHOLDS = np.array([1_000_000.0, 100_000_000.0, 1_000_000_000_000.0])
+
+def classify_matrix(vals: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """금액 배열(1차원/2차원)을 _classify_unit과 같은 기준으로 한 번에 분류 (단위 코드, 환산 값)
+
+    NaN의 단위 코드는 의미가 없으므로 호출 측에서 결측 마스크로 걸러서 사용해야 합니다.
+    """
+    # 경계값마다 비교·대입을 반복하지 않고 한 번의 이진 탐색으로 단위 코드를 구함
+    # (side='right'이므로 경계값과 같은 금액은 큰 단위로 분류)
+    unit = np.searchsorted(_UNIT_THRESHOLDS, np.abs(vals), side='right').astype(np.uint8)
+    # 부호는 유지한 채 단위로 나눔 (NaN은 그대로 NaN)
+    scaled = vals / _UNIT_DIVISORS[unit]
+    return unit, scaled
@@ -0,0 +1,30 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable
+
+class KeyedLocks:
+    """키별 asyncio.Lock 모음. 잠금을 기다리거나 쥔 요청이 있는 동안만 보관해 키가 늘어나도 메모리가 커지지 않음"""
+
+    def __init__(self) -> None:
+        # 키 -> (잠금, 사용 중인 요청 수)
+        self._locks: dict[Hashable, tuple[asyncio.Lock, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        lock, users = self._locks.get(key, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            # 대기 중 취소된 경우에도 사용 수를 되돌리고, 마지막 요청이면 잠금을 제거
+            lock, users = self._locks[key]
+            if users <= 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
@@ -1,12 +1,19 @@
 from fastapi import FastAPI, HTTPException, Query, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
 from cachetools import TTLCache
-import pandas as pd
+from pydantic import TypeAdapter
+from typing import Any, Literal
 import openai
+import orjson
+import asyncio
+import heapq
 import httpx
 import logging
+import sys
+import time
 
 # --- 내부 모듈 임포트 ---
 from .config import Settings
@@ -14,12 +21,13 @@ from .schemas import (
     TranslationRequest, TranslationResponse, OfficersResponse,
     FinancialStatementResponse, PriceHistoryResponse, NewsResponse,
     AIChatRequest, AIChatResponse, StockProfile, FinancialSummary, 
-    InvestmentMetrics, MarketData, AnalystRecommendations, StockOverviewResponse, Officer,
+    InvestmentMetrics, MarketData, AnalystRecommendations, StockOverviewResponse,
     SectorTickerResponse, SectorAnalysisRequest, SectorAnalysisResponse, 
     PerformanceAnalysisRequest, PerformanceAnalysisResponse,
     StockComparisonRequest, StockComparisonResponse,
     TradingVolumeRequest, TradingVolumeResponse, NetPurchaseRequest, NetPurchaseResponse,
-    FluctuationAnalysisRequest, FluctuationAnalysisResponse
+    FluctuationAnalysisRequest, FluctuationAnalysisResponse, DateStr,
+    StockBundleResponse
 )
 from .services.yahoo_finance import YahooFinanceService
 from .services.krx_service import PyKRXService
@@ -28,8 +36,10 @@ from .services.translation import TranslationService
 from .services.llm import LLMService
 from .services.performance_service import PerformanceService
 from .services.fluctuation_service import FluctuationService
+from .services.file_cache import FileCache
 
 from .core import formatting
+from .core.single_flight import KeyedLocks
 
 # 로거 설정 (print 대신 사용하면 더 체계적인 로깅이 가능합니다)
 logging.basicConfig(
@@ -41,22 +51,66 @@ logger = logging.getLogger(__name__)
 # --- ✅ 애플리케이션 및 서비스 인스턴스 생성 ---
 # 앱이 시작될 때 단 한 번만 실행되어 객체들이 생성됩니다.
 settings = Settings()
+
+def create_http_client() -> httpx.AsyncClient:
+    """외부 API 호출에 공유할 HTTP 클라이언트를 생성합니다."""
+    # transport를 직접 지정하면 클라이언트의 limits는 적용되지 않으므로 연결 수 제한도 transport에 설정
+    # 연결 실패(연결 거부, DNS 오류 등)는 전송 계층에서 두 번까지 재시도해 기본 환율로 떨어지는 경우를 줄임
+    return httpx.AsyncClient(
+        timeout=5.0,
+        transport=httpx.AsyncHTTPTransport(
+            retries=2,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4)
+        )
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 수명 동안 공유할 HTTP 클라이언트(커넥션 풀)를 생성하고 종료 시 정리합니다."""
+    app.state.http = create_http_client()
+    yield
+    await app.state.http.aclose()
+    await news_service.close()
+    translation_service.close()
+
 app = FastAPI(
     title="My Stock App API",
     version="2.0.0",
-    description="기업 정보 조회, 재무제표, AI 분석 기능을 제공하는 API입니다."
+    description="기업 정보 조회, 재무제표, AI 분석 기능을 제공하는 API입니다.",
+    lifespan=lifespan
 )
 
-yfs_service = YahooFinanceService()
+yfs_service = YahooFinanceService(settings)
 krx_service = PyKRXService()
 news_service = NewsService()
 performance_service = PerformanceService()
-translation_service = TranslationService()
+translation_service = TranslationService(settings.GOOGLE_TRANSLATE_API_KEY)
 llm_service = LLMService(settings)
 fluctuation_service = FluctuationService()
 
-# 환율 정보 캐시 (1시간 TTL)
+# 환율 정보 캐시 (1시간 TTL, 값은 (환율, 조회 시각))
 exchange_rate_cache = TTLCache(maxsize=1, ttl=settings.CACHE_TTL_SECONDS)
+# 프로세스 캐시가 비었을 때 확인하는 디스크 캐시 (재시작 직후나 다른 워커가 조회한 환율을 재사용)
+# 환율 API 장애 시 기본값 대신 사용할 마지막 환율의 최대 경과 시간 (7일)
+_FX_STALE_MAX_SECONDS = 7 * 86400
+fx_file_cache = FileCache(settings.FX_CACHE_DIR, memory_size=4, max_age=_FX_STALE_MAX_SECONDS)
+_FX_CACHE_KEY = ("USD", "KRW")
+# 캐시 만료 5분 전부터는 요청을 기다리게 하지 않고 백그라운드에서 미리 갱신
+_FX_REFRESH_AHEAD_SECONDS = 300
+_fx_refresh_task: asyncio.Task | None = None
+# 환율 API가 연속으로 실패하면 잠시 호출을 건너뛰어 요청마다 타임아웃을 기다리지 않도록 함
+_FX_BREAKER_MAX_FAILURES = 3
+_FX_BREAKER_RESET_SECONDS = 60
+_fx_failures = 0
+_fx_breaker_open_until = 0.0
+# 캐시 만료 직후 동시 요청이 몰려도 환율 API는 한 번만 호출되도록 직렬화
+_rate_lock = asyncio.Lock()
+
+# 종목 기본 정보 캐시 (대시보드의 여러 패널이 같은 종목을 동시에 조회할 때 한 번만 가져오도록)
+_info_cache = TTLCache(maxsize=1024, ttl=settings.INFO_CACHE_TTL_SECONDS)
+_info_locks = KeyedLocks()
+# 재무제표 3종 탭이 동시에 요청해도 Yahoo 조회(재무제표 3건)는 종목당 한 번만 실행되도록 직렬화
+_financials_locks = KeyedLocks()
 
 # CORS 설정
 app.add_middleware(
@@ -92,6 +146,29 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         headers=exc.headers,
     )
 
+# --- ✅ 응답 직렬화기 ---
+class ORJSONResponse(JSONResponse):
+    """orjson으로 직렬화하는 JSON 응답 (NumPy 값과 NaN(null) 처리 지원)
+
+    앱 기본 응답 클래스로 지정하면 response_model 라우트에서 FastAPI의 pydantic 직렬화 경로가 꺼지므로,
+    핸들러가 직접 조립한 데이터를 반환하는 곳에서만 명시적으로 사용합니다.
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+# 스키마별 검증/직렬화기를 시작 시 한 번만 생성해 두고, 핸들러에서 바로 JSON 바이트로 변환합니다.
+_OVERVIEW_ADAPTER = TypeAdapter(StockOverviewResponse)
+_PROFILE_ADAPTER = TypeAdapter(StockProfile)
+_FIN_SUMMARY_ADAPTER = TypeAdapter(FinancialSummary)
+_METRICS_ADAPTER = TypeAdapter(InvestmentMetrics)
+_MARKET_DATA_ADAPTER = TypeAdapter(MarketData)
+_RECOMMENDATIONS_ADAPTER = TypeAdapter(AnalystRecommendations)
+
+def _model_response(adapter: TypeAdapter, data) -> Response:
+    """미리 생성한 TypeAdapter로 검증 후 곧바로 JSON 직렬화 (FastAPI의 범용 인코딩 경로 생략)"""
+    return Response(adapter.dump_json(adapter.validate_python(data), by_alias=True), media_type="application/json")
+
 # --- ✅ 의존성 주입 함수 ---
 def get_settings() -> Settings:
     return settings
@@ -117,84 +194,138 @@ def get_translation_service() -> TranslationService:
 def get_llm_service() -> LLMService:
     return llm_service
 
+# --- 종목 심볼 정규화 의존성 함수 ---
+def get_symbol(symbol: str) -> str:
+    """경로의 종목 심볼을 요청당 한 번만 대문자로 정규화 (반복되는 티커 문자열은 intern)"""
+    return sys.intern(symbol.upper())
+
 # --- 환율 조회 의존성 함수 ---
-async def get_exchange_rate(settings: Settings = Depends(get_settings)) -> float:
-    if 'rate' in exchange_rate_cache:
-        return exchange_rate_cache['rate']
-    
+async def _fetch_exchange_rate(http: httpx.AsyncClient, settings: Settings) -> float:
+    """환율 API를 호출해 (환율, 조회 시각)으로 두 캐시를 갱신합니다. (실패 시 예외 발생)"""
+    global _fx_failures, _fx_breaker_open_until
+    if _fx_failures >= _FX_BREAKER_MAX_FAILURES:
+        # 반개방 상태: 대기 시간이 지난 뒤 이 호출 하나만 시험 삼아 보내고, 결과가 나올 때까지 다른 호출은 계속 차단
+        _fx_breaker_open_until = time.monotonic() + _FX_BREAKER_RESET_SECONDS
+    try:
+        response = await http.get(settings.EXCHANGE_RATE_API_URL, params={"from": "USD", "to": "KRW"})
+        response.raise_for_status()
+        rate = float(response.json()["rates"]["KRW"])
+    except Exception:
+        # 실패 횟수는 성공할 때까지 유지해, 시험 호출이 실패하면 곧바로 다시 차단
+        _fx_failures += 1
+        if _fx_failures >= _FX_BREAKER_MAX_FAILURES:
+            _fx_breaker_open_until = time.monotonic() + _FX_BREAKER_RESET_SECONDS
+            logger.warning(f"환율 API가 연속으로 실패해 {_FX_BREAKER_RESET_SECONDS}초 동안 호출을 중단합니다.")
+        raise
+    _fx_failures = 0
+    _fx_breaker_open_until = 0.0
+    entry = (rate, time.time())
+    exchange_rate_cache['rate'] = entry
+    fx_file_cache.set('usd_krw', _FX_CACHE_KEY, entry)
+    return rate
+
+async def _refresh_exchange_rate(http: httpx.AsyncClient, settings: Settings) -> None:
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(settings.EXCHANGE_RATE_API_URL, params={"from": "USD", "to": "KRW"})
-            response.raise_for_status()
-            rate = float(response.json()["rates"]["KRW"])
-            exchange_rate_cache['rate'] = rate
-            return rate
+        await _fetch_exchange_rate(http, settings)
     except Exception as e:
-        logger.error(f"환율 정보 조회 실패: {e}", exc_info=True)
-        return settings.DEFAULT_KRW_RATE
+        # 기존 환율이 아직 유효하므로 경고만 남기고, 만료 후 첫 요청에서 다시 시도
+        logger.warning(f"환율 백그라운드 갱신 실패: {e}")
+
+def _refresh_exchange_rate_ahead(entry: tuple, request: Request, settings: Settings) -> None:
+    """만료가 가까운 환율은 그대로 반환하고, 갱신은 백그라운드에서 한 번만 실행"""
+    global _fx_refresh_task
+    if time.time() - entry[1] < settings.CACHE_TTL_SECONDS - _FX_REFRESH_AHEAD_SECONDS:
+        return
+    if _fx_refresh_task is not None and not _fx_refresh_task.done():
+        return
+    if time.monotonic() < _fx_breaker_open_until:
+        return
+    _fx_refresh_task = asyncio.create_task(_refresh_exchange_rate(request.app.state.http, settings))
+
+async def get_exchange_rate(request: Request, settings: Settings = Depends(get_settings)) -> float:
+    entry = exchange_rate_cache.get('rate')
+    if entry is not None:
+        _refresh_exchange_rate_ahead(entry, request, settings)
+        return entry[0]
+
+    async with _rate_lock:
+        # 락을 기다리는 동안 다른 요청이 이미 갱신했을 수 있으므로 다시 확인
+        entry = exchange_rate_cache.get('rate')
+        if entry is not None:
+            return entry[0]
+        entry = fx_file_cache.get('usd_krw', _FX_CACHE_KEY, settings.CACHE_TTL_SECONDS)
+        if entry is not None:
+            exchange_rate_cache['rate'] = entry
+            return entry[0]
+        if time.monotonic() >= _fx_breaker_open_until:
+            try:
+                # lifespan에서 생성한 공유 클라이언트로 커넥션을 재사용
+                return await _fetch_exchange_rate(request.app.state.http, settings)
+            except Exception as e:
+                logger.error(f"환율 정보 조회 실패: {e}", exc_info=True)
+        # 만료됐더라도 최근에 조회한 환율이 있으면 고정 기본값보다 우선 사용
+        stale = fx_file_cache.get('usd_krw', _FX_CACHE_KEY, _FX_STALE_MAX_SECONDS)
+        return stale[0] if stale is not None else settings.DEFAULT_KRW_RATE
 
 # --- 공통 의존성: yfinance 정보 조회 ---
 async def get_yfinance_info(
-    symbol: str,
+    symbol: str = Depends(get_symbol),
     yfs: YahooFinanceService = Depends(get_yahoo_finance_service)
 ) -> dict:
-    symbol_upper = symbol.upper()
-    info = None
-    if len(symbol_upper) == 6 and symbol_upper.isdigit():
-        logger.info(f"'{symbol_upper}'는 한국 주식이므로 pykrx와 yfinance(.KS/.KQ)로 정보를 조합합니다.")
-        info = await run_in_threadpool(yfs.get_kr_stock_info_combined, symbol_upper)
-    else:
-        logger.info(f"'{symbol_upper}'는 해외 주식이므로 yfinance로 정보를 조회합니다.")
-        info = await run_in_threadpool(yfs.get_stock_info, symbol_upper)
+    info = _info_cache.get(symbol)
+    if info is not None:
+        return info
+
+    async with _info_locks.hold(symbol):
+        # 같은 종목의 동시 요청은 먼저 들어온 요청의 결과를 재사용
+        info = _info_cache.get(symbol)
+        if info is None:
+            if len(symbol) == 6 and symbol.isdigit():
+                logger.info(f"'{symbol}'는 한국 주식이므로 pykrx와 yfinance(.KS/.KQ)로 정보를 조합합니다.")
+                info = await run_in_threadpool(yfs.get_kr_stock_info_combined, symbol)
+            else:
+                logger.info(f"'{symbol}'는 해외 주식이므로 yfinance로 정보를 조회합니다.")
+                info = await run_in_threadpool(yfs.get_stock_info, symbol)
+            # 실패한 결과는 캐시하지 않음
+            if info:
+                _info_cache[symbol] = info
 
     if not info:
-        raise HTTPException(status_code=404, detail=f"'{symbol.upper()}'에 대한 기업 정보를 찾을 수 없습니다.")
+        raise HTTPException(status_code=404, detail=f"'{symbol}'에 대한 기업 정보를 찾을 수 없습니다.")
     return info
 
-# --- ‼️ API 엔드포인트 코드는 변경할 필요 없습니다. ---
-@app.get("/", tags=["Root"])
-def read_root():
-    return {"message": "Stock App API v1.0.0"}
-
-# --- ✅ 통합 정보 조회 엔드포인트 ---
-@app.get("/api/stock/{symbol}/overview", response_model=StockOverviewResponse, tags=["Stock Info"])
-async def get_stock_overview(
-    symbol: str,
-    info: dict = Depends(get_yfinance_info),
-    ts: TranslationService = Depends(get_translation_service),
-    rate: float = Depends(get_exchange_rate)
-):
-    """
-    한 번의 요청으로 기업 프로필, 재무 요약, 지표 등 모든 주요 정보를 조회합니다.
-    """
-    # 1. get_yfinance_info 의존성 주입을 통해 'info' 객체를 한 번만 가져옵니다.
+# --- 응답 조립 헬퍼 (개별 엔드포인트와 번들 엔드포인트가 공유) ---
+def _format_officers(officers_raw: list | None, symbol: str, rate: float) -> list[dict]:
+    if not officers_raw:
+        return []
+    # 전체 정렬 없이 급여 상위 5명만 선택 (totalPay가 None인 경우도 0으로 취급)
+    top_officers = heapq.nlargest(5, officers_raw, key=lambda x: x.get('totalPay', 0) or 0)
+    # 급여는 배열 연산으로 한 번에 포맷팅
+    total_pays = formatting.format_currency_batch([o.get("totalPay") for o in top_officers], symbol, rate)
+    return [
+        {
+            "name": o.get("name", ""),
+            "title": o.get("title", ""), 
+            "totalPay": total_pay
+        }
+        for o, total_pay in zip(top_officers, total_pays)
+    ]
 
-    # 2. 회사 프로필 (번역 포함)
+async def _build_overview(symbol: str, info: dict, rate: float, ts: TranslationService) -> dict:
+    # 1. 회사 프로필 (번역 포함)
     summary_kr = await run_in_threadpool(ts.translate_to_korean, info.get('longBusinessSummary', ''))
     profile_data = formatting.format_stock_profile(info, summary_kr)
 
-    # 3. 각 정보 포맷팅
+    # 2. 각 정보 포맷팅
     summary_data = formatting.format_financial_summary(info, symbol, rate)
     metrics_data = formatting.format_investment_metrics(info)
     market_data = formatting.format_market_data(info, symbol, rate)
     recommendations_data = formatting.format_analyst_recommendations(info)
 
-    # 4. 임원 정보 포맷팅 (info 객체 재사용으로 최적화)
-    officers_raw = info.get("companyOfficers", [])
-    formatted_officers = []
-    if officers_raw:
-        # 급여 기준으로 상위 5명 정렬
-        top_officers = sorted(officers_raw, key=lambda x: x.get('totalPay', 0), reverse=True)[:5]
-        formatted_officers = [
-            {
-                "name": o.get("name", ""),
-                "title": o.get("title", ""), 
-                "totalPay": formatting.format_currency(o.get("totalPay"), symbol, rate)
-            }
-            for o in top_officers
-        ]
-
-    # 5. 최종 응답 객체 조립
+    # 3. 임원 정보 포맷팅 (info 객체 재사용으로 최적화)
+    formatted_officers = _format_officers(info.get("companyOfficers"), symbol, rate)
+
+    # 4. 최종 응답 객체 조립
     return {
         "profile": profile_data,
         "summary": summary_data,
@@ -204,6 +335,51 @@ async def get_stock_overview(
         "officers": formatted_officers
     }
 
+async def _load_financials(symbol: str, yfs: YahooFinanceService) -> dict | None:
+    """재무제표 3종을 조회 (먼저 들어온 요청이 채운 캐시를 뒤이은 동시 요청이 재사용)"""
+    async with _financials_locks.hold(symbol):
+        return await run_in_threadpool(yfs.get_financials, symbol)
+
+async def _load_price_history(symbol: str, start_date: str, end_date: str, yfs: YahooFinanceService, krx: PyKRXService) -> dict | None:
+    """기간별 주가를 응답 형태(dict)로 조회 (데이터가 없으면 None)"""
+    if len(symbol) == 6 and symbol.isdigit():
+        df_raw, adjusted_end = await run_in_threadpool(krx.get_price_history_kr, symbol, start_date, end_date)
+    else:
+        df_raw, adjusted_end = await run_in_threadpool(yfs.get_price_history, symbol, start_date, end_date)
+    if df_raw is None or df_raw.empty:
+        return None
+    return {
+        "symbol": symbol,
+        "startDate": start_date,
+        "endDate": adjusted_end if adjusted_end else end_date,
+        "data": formatting.price_history_records(df_raw)
+    }
+
+# --- ‼️ API 엔드포인트 코드는 변경할 필요 없습니다. ---
+@app.get("/", tags=["Root"])
+def read_root():
+    return {"message": "Stock App API v1.0.0"}
+
+# --- ✅ 통합 정보 조회 엔드포인트 ---
+@app.get("/api/stock/{symbol}/overview", response_model=StockOverviewResponse, tags=["Stock Info"])
+async def get_stock_overview(
+    request: Request,
+    symbol: str = Depends(get_symbol),
+    yfs: YahooFinanceService = Depends(get_yahoo_finance_service),
+    ts: TranslationService = Depends(get_translation_service),
+    settings: Settings = Depends(get_settings)
+):
+    """
+    한 번의 요청으로 기업 프로필, 재무 요약, 지표 등 모든 주요 정보를 조회합니다.
+    """
+    # 1. 기업 정보와 환율은 서로 독립적이므로 의존성으로 순차 해석하지 않고 동시에 가져옵니다.
+    info, rate = await asyncio.gather(
+        get_yfinance_info(symbol, yfs),
+        get_exchange_rate(request, settings)
+    )
+
+    return _model_response(_OVERVIEW_ADAPTER, await _build_overview(symbol, info, rate, ts))
+
 # ✨ 회사 기본 정보 조회
 @app.get("/api/stock/{symbol}/profile", response_model=StockProfile, tags=["Stock Info"])
 async def get_stock_profile(
@@ -212,118 +388,135 @@ async def get_stock_profile(
 ):
     summary = info.get('longBusinessSummary', '')
     summary_kr = await run_in_threadpool(ts.translate_to_korean, summary)
-    return formatting.format_stock_profile(info, summary_kr)
+    return _model_response(_PROFILE_ADAPTER, formatting.format_stock_profile(info, summary_kr))
 
 # ✨ 재무 요약 정보 조회
 @app.get("/api/stock/{symbol}/financial-summary", response_model=FinancialSummary, tags=["Stock Info"])
 async def get_financial_summary(
-    symbol: str,
+    symbol: str = Depends(get_symbol),
     info: dict = Depends(get_yfinance_info),
     rate: float = Depends(get_exchange_rate)
 ):
-    return formatting.format_financial_summary(info, symbol, rate)
+    return _model_response(_FIN_SUMMARY_ADAPTER, formatting.format_financial_summary(info, symbol, rate))
 
 # ✨ 투자 지표 조회 
 @app.get("/api/stock/{symbol}/metrics", response_model=InvestmentMetrics, tags=["Stock Info"])
 async def get_investment_metrics(info: dict = Depends(get_yfinance_info)):
-    return formatting.format_investment_metrics(info)
+    return _model_response(_METRICS_ADAPTER, formatting.format_investment_metrics(info))
 
 # ✨ 주가/시장 정보 조회
 @app.get("/api/stock/{symbol}/market-data", response_model=MarketData, tags=["Stock Info"])
 async def get_market_data(
-    symbol: str,
+    symbol: str = Depends(get_symbol),
     info: dict = Depends(get_yfinance_info),
     rate: float = Depends(get_exchange_rate)
 ):
-    return formatting.format_market_data(info, symbol, rate)
+    return _model_response(_MARKET_DATA_ADAPTER, formatting.format_market_data(info, symbol, rate))
 
 # ✨ 분석가 의견 조회
 @app.get("/api/stock/{symbol}/recommendations", response_model=AnalystRecommendations, tags=["Stock Info"])
 async def get_analyst_recommendations(info: dict = Depends(get_yfinance_info)):
-    return formatting.format_analyst_recommendations(info)
+    return _model_response(_RECOMMENDATIONS_ADAPTER, formatting.format_analyst_recommendations(info))
 
 @app.get("/api/stock/{symbol}/officers", response_model=OfficersResponse, tags=["Stock Details"])
 async def get_stock_officers(
-    symbol: str,
+    symbol: str = Depends(get_symbol),
     yfs: YahooFinanceService = Depends(get_yahoo_finance_service),
     rate: float = Depends(get_exchange_rate)
 ):
-    officers_raw = await run_in_threadpool(yfs.get_officers, symbol.upper())
-    
-    if officers_raw is None:
-         # 서비스 단에서 None을 반환하는 경우는 이미 로깅되었으므로 여기선 바로 반환
+    # /overview, /profile 등과 같은 info 캐시를 공유해 임원 정보만을 위한 중복 조회를 하지 않음
+    try:
+        info = await get_yfinance_info(symbol, yfs)
+    except HTTPException:
+        # 기업 정보를 찾지 못한 경우는 get_yfinance_info에서 이미 판별되었으므로 빈 목록 반환
         return {"officers": []}
+
+    officers_raw = info.get("companyOfficers")
     if not officers_raw:
-        logger.info(f"'{symbol.upper()}'에 대한 임원 정보가 비어있습니다.")
+        logger.info(f"'{symbol}'에 대한 임원 정보가 비어있습니다.")
         return {"officers": []}
 
-    top_officers = sorted(officers_raw, key=lambda x: x.get('totalPay', 0), reverse=True)[:5]
-    
-    formatted_officers = [
-        Officer(
-            name=o.get("name", ""),
-            title=o.get("title", ""),
-            totalPay=formatting.format_currency(o.get("totalPay"), symbol, rate)
-        )
-        for o in top_officers
-    ]
-    return {"officers": formatted_officers}
+    return {"officers": _format_officers(officers_raw, symbol, rate)}
 
 # ✨ 재무제표 조회 (income, balance, cashflow)
 @app.get("/api/stock/{symbol}/financials/{statement_type}", response_model=FinancialStatementResponse, tags=["Stock Details"])
 async def get_financial_statement(
-    symbol: str, statement_type: str,
+    # 잘못된 유형은 핸들러 실행 전에 요청 검증 단계에서 422로 거부됩니다.
+    statement_type: Literal["income", "balance", "cashflow"],
+    symbol: str = Depends(get_symbol),
     yfs: YahooFinanceService = Depends(get_yahoo_finance_service)
 ):
-
-    if statement_type not in ["income", "balance", "cashflow"]:
-        raise HTTPException(status_code=400, detail="잘못된 재무제표 유형입니다. 'income', 'balance', 'cashflow' 중 하나여야 합니다.")
-
-    fin_data = await run_in_threadpool(yfs.get_financials, symbol.upper())
+    fin_data = await _load_financials(symbol, yfs)
     if not fin_data:
-        raise HTTPException(status_code=404, detail=f"'{symbol.upper()}'에 대한 재무 데이터를 가져오지 못했습니다.")
+        raise HTTPException(status_code=404, detail=f"'{symbol}'에 대한 재무 데이터를 가져오지 못했습니다.")
     
     df_raw = fin_data.get(statement_type)
 
     if df_raw is None or df_raw.empty:
-        raise HTTPException(status_code=404, detail=f"'{symbol.upper()}'에 대한 {statement_type} 데이터를 찾을 수 없습니다.")
+        raise HTTPException(status_code=404, detail=f"'{symbol}'에 대한 {statement_type} 데이터를 찾을 수 없습니다.")
         
     return formatting.format_financial_statement_response(df_raw, statement_type, symbol)
 
 # ✨ 기간별 주가 히스토리 조회
 @app.get("/api/stock/{symbol}/history", response_model=PriceHistoryResponse, tags=["Stock Details"])
 async def get_stock_history(
-    symbol: str,
-    start_date: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$"),
-    end_date: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    start_date: DateStr,
+    end_date: DateStr,
+    symbol: str = Depends(get_symbol),
     yfs: YahooFinanceService = Depends(get_yahoo_finance_service),
     krx: PyKRXService = Depends(get_krx_service)
 ):
-    symbol_upper = symbol.upper()
-    df_raw, adjusted_end = None, None
-    if len(symbol_upper) == 6 and symbol_upper.isdigit():
-        df_raw, adjusted_end = await run_in_threadpool(krx.get_price_history_kr, symbol_upper, start_date, end_date)
-    else:
-        df_raw, adjusted_end = await run_in_threadpool(yfs.get_price_history, symbol_upper, start_date, end_date)
-    if df_raw is None or df_raw.empty:
+    history = await _load_price_history(symbol, start_date, end_date, yfs, krx)
+    if history is None:
         raise HTTPException(status_code=404, detail=f"해당 기간의 주가 데이터를 찾을 수 없습니다.")
-    display_df = formatting.process_price_dataframe(df_raw)
-    return {
-        "symbol": symbol_upper,
-        "startDate": start_date,
-        "endDate": adjusted_end if adjusted_end else end_date,
-        "data": display_df.to_dict("records")
-    }
+    # 응답 모델과 동일한 형태이므로 pydantic 재검증 없이 orjson으로 바로 직렬화
+    return ORJSONResponse(history)
+
+# ✨ 종목 페이지 번들 조회 (개요 + 재무제표 3종 + 주가 히스토리)
+@app.get("/api/stock/{symbol}/bundle", response_model=StockBundleResponse, tags=["Stock Info"])
+async def get_stock_bundle(
+    request: Request,
+    start_date: DateStr,
+    end_date: DateStr,
+    symbol: str = Depends(get_symbol),
+    yfs: YahooFinanceService = Depends(get_yahoo_finance_service),
+    krx: PyKRXService = Depends(get_krx_service),
+    ts: TranslationService = Depends(get_translation_service),
+    settings: Settings = Depends(get_settings)
+):
+    """
+    종목 페이지에 필요한 데이터를 한 번의 요청으로 동시에 조회합니다.
+    (재무제표·주가가 없으면 해당 항목만 비워서 반환)
+    """
+    info, rate, fin_data, history = await asyncio.gather(
+        get_yfinance_info(symbol, yfs),
+        get_exchange_rate(request, settings),
+        _load_financials(symbol, yfs),
+        _load_price_history(symbol, start_date, end_date, yfs, krx)
+    )
+    overview = await _build_overview(symbol, info, rate, ts)
+
+    financials = {}
+    for statement_type, df_raw in (fin_data or {}).items():
+        if df_raw is not None and not df_raw.empty:
+            financials[statement_type] = formatting.format_financial_statement_response(df_raw, statement_type, symbol)
+
+    # 개요는 개별 엔드포인트와 같은 규칙으로 검증하고, 이미 응답 형태인 재무제표·주가는 그대로 직렬화
+    return ORJSONResponse({
+        "overview": _OVERVIEW_ADAPTER.dump_python(_OVERVIEW_ADAPTER.validate_python(overview), mode="json", by_alias=True),
+        "financials": financials,
+        "history": history
+    })
 
 @app.get("/api/stock/{symbol}/news", response_model=NewsResponse, tags=["Stock Details"])
 async def get_yahoo_rss_news(
-    symbol: str, limit: int = Query(10, ge=1, le=50),
+    symbol: str = Depends(get_symbol), limit: int = Query(10, ge=1, le=50),
     ns: NewsService = Depends(get_news_service)
 ):
     """Yahoo Finance RSS 뉴스 조회"""
-    news_list = await ns.get_yahoo_rss_news(symbol.upper(), limit)
+    news_list = await ns.get_yahoo_rss_news(symbol, limit)
     if not news_list:
-        logger.warning(f"'{symbol.upper()}'에 대한 뉴스를 가져오지 못했습니다.")
+        logger.warning(f"'{symbol}'에 대한 뉴스를 가져오지 못했습니다.")
     return {"news": news_list}
 
 # --- 유틸리티 및 AI 엔드포인트 ---
@@ -336,6 +529,17 @@ async def translate_text(
     translated_text = await run_in_threadpool(ts.translate_to_korean, req.text)
     return {"translated_text": translated_text}
 
+def _ai_service_error(e: openai.APIError) -> HTTPException:
+    """OpenAI 오류를 클라이언트에 전달할 HTTPException으로 변환"""
+    # 연결 오류 등 상태 코드가 없는 오류는 503으로 처리
+    status_code = getattr(e, "status_code", None) or 503
+    logger.error(f"OpenAI API 오류 발생: {status_code} - {e.message}", exc_info=True)
+    # APIError에서 받은 상태 코드와 메시지를 그대로 클라이언트에게 전달
+    return HTTPException(
+        status_code=status_code,
+        detail=f"AI 서비스에 문제가 발생했습니다: {e.message}"
+    )
+
 @app.post("/api/ai/chat", response_model=AIChatResponse, tags=["AI"])
 async def chat_with_ai(
     req: AIChatRequest,
@@ -352,12 +556,45 @@ async def chat_with_ai(
         )
         return {"response": response}
     except openai.APIError as e:
-        logger.error(f"OpenAI API 오류 발생: {e.status_code} - {e.message}", exc_info=True)
-        # APIError에서 받은 상태 코드와 메시지를 그대로 클라이언트에게 전달
-        raise HTTPException(
-            status_code=e.status_code or 503, 
-            detail=f"AI 서비스에 문제가 발생했습니다: {e.message}"
+        raise _ai_service_error(e)
+
+@app.post("/api/ai/chat/stream", tags=["AI"])
+async def stream_chat_with_ai(
+    req: AIChatRequest,
+    request: Request,
+    llm: LLMService = Depends(get_llm_service)
+):
+    """LLM 답변을 Server-Sent Events로 스트리밍 (생성되는 대로 전송해 첫 글자까지의 지연 단축)"""
+    try:
+        deltas = await llm.stream_qa_response(
+            symbol=req.symbol,
+            user_question=req.question,
+            financial_data=req.financial_data,
+            history_data=req.history_data,
+            news_data=req.news_data
         )
+    except openai.APIError as e:
+        raise _ai_service_error(e)
+
+    async def event_stream():
+        try:
+            async for text in deltas:
+                # 클라이언트가 떠났으면 남은 답변을 더 받지 않고 중단
+                if await request.is_disconnected():
+                    logger.info("AI 스트리밍 중 클라이언트 연결이 종료되어 응답 생성을 중단합니다.")
+                    return
+                yield b"data: " + orjson.dumps({"delta": text}) + b"\n\n"
+        except openai.APIError as e:
+            # 이미 응답을 시작했으므로 상태 코드 대신 error 이벤트로 알림
+            logger.error(f"OpenAI 스트리밍 중 오류 발생: {e}", exc_info=True)
+            yield b"event: error\ndata: " + orjson.dumps({"detail": f"AI 서비스에 문제가 발생했습니다: {e.message}"}) + b"\n\n"
+            return
+        finally:
+            # 중단되거나 취소돼도 업스트림 스트림을 닫음
+            await deltas.aclose()
+        yield b"data: [DONE]\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 # --- 🎯 섹터 분석 API 엔드포인트 ---    
 @app.get("/api/sectors/groups", tags=["Sector Analysis"])
@@ -397,7 +634,8 @@ async def analyze_sectors(
             # 서비스 단에서 빈 리스트를 반환한 경우 (분석할 데이터 없음)
             raise HTTPException(status_code=404, detail="분석할 유효한 데이터를 찾을 수 없습니다.")
 
-        return {"data": analysis_result}
+        # 날짜 × 섹터 행은 서비스에서 응답 형태로 만들어 오므로, extra 필드 재검증 없이 orjson으로 바로 직렬화
+        return ORJSONResponse({"data": analysis_result})
     except Exception as e:
         logger.error(f"섹터 분석 API 오류: request={request.dict()}, error={e}", exc_info=True)
         # 이미 HTTPException이 아닌 경우 500으로 처리
@@ -454,18 +692,17 @@ async def compare_stocks(
             raise HTTPException(status_code=404, detail="분석할 유효한 주가 데이터를 찾을 수 없습니다.")
 
         # 결과를 JSON 직렬화 가능한 형태로 포맷팅
-        df_normalized.index = df_normalized.index.strftime('%Y-%m-%d')
-        df_normalized = df_normalized.where(pd.notnull(df_normalized), None) # NaN -> null
+        dates = df_normalized.index.strftime('%Y-%m-%d').tolist()
+        valid_tickers = df_normalized.columns.tolist()
         
         # recharts에 맞는 데이터 형태로 변환 ('date' 키 포함)
-        result_list = df_normalized.reset_index().to_dict(orient='records')
-        formatted_data = [{'date': item['Date'], **{k: v for k, v in item.items() if k != 'Date'}} for item in result_list]
+        # NaN은 orjson이 null로 직렬화하므로 셀 단위 where 변환과 to_dict 없이 NumPy 행을 그대로 사용
+        formatted_data = [{'date': date, **dict(zip(valid_tickers, row))} for date, row in zip(dates, df_normalized.to_numpy().tolist())]
 
         # 차트의 각 라인(series) 정보 생성 (유효한 티커만 포함)
-        valid_tickers = df_normalized.columns.tolist()
         series = [{"dataKey": ticker, "name": ticker} for ticker in valid_tickers]
 
-        return {"data": formatted_data, "series": series}
+        return ORJSONResponse({"data": formatted_data, "series": series})
 
     except Exception as e:
         logger.error(f"주가 비교 분석 API 오류: request={request.dict()}, error={e}", exc_info=True)
@@ -1,5 +1,11 @@
+from fastapi import Query
 from pydantic import BaseModel, Field, HttpUrl
-from typing import List, Optional, Dict, Any
+from typing import Annotated, List, Optional, Dict, Any
+
+# --- 공통 쿼리 파라미터 타입 ---
+# 날짜 쿼리 파라미터(YYYY-MM-DD)의 형식을 한 곳에서 정의해 여러 엔드포인트가 공유
+DATE_RE = r"^\d{4}-\d{2}-\d{2}$"
+DateStr = Annotated[str, Query(pattern=DATE_RE, examples=["2024-01-01"])]
 
 class TranslationRequest(BaseModel):
     text: str
@@ -109,6 +115,11 @@ class PriceHistoryResponse(BaseModel):
     end_date: str = Field(..., alias="endDate")
     data: List[PriceHistoryData]
 
+class StockBundleResponse(BaseModel):
+    overview: StockOverviewResponse
+    financials: Dict[str, FinancialStatementResponse]
+    history: Optional[PriceHistoryResponse] = None
+
 class NewsItem(BaseModel):
     title: str
     url: HttpUrl
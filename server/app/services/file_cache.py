@@ -0,0 +1,112 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from cachetools import LRUCache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+class FileCache:
+    """외부 API 응답(DataFrame, dict 등)을 디스크에 저장해 서버 재시작 후에도 재사용하는 TTL 캐시
+
+    최근 항목은 메모리에도 보관해 디스크 읽기와 역직렬화를 생략합니다.
+    반환값은 캐시와 공유되므로 호출 측에서 수정하지 않아야 합니다.
+    """
+
+    def __init__(self, root: str, memory_size: int = 256, max_entries: int = 2048, max_age: int | None = None):
+        self.root = root
+        # 디스크에 보관할 최대 파일 수 (요청 파라미터로 키가 늘어나므로 넘으면 오래된 파일부터 삭제)
+        self.max_entries = max_entries
+        # 이보다 오래된 파일은 정리 시 삭제 (호출 측이 쓰는 가장 긴 TTL 이상이어야 함, None이면 개수로만 정리)
+        self.max_age = max_age
+        # (저장 시각, 값)을 보관하는 메모리 캐시 (스레드풀에서 호출되므로 잠금으로 보호)
+        self._memory = LRUCache(maxsize=memory_size)
+        self._lock = threading.Lock()
+
+    def _path(self, namespace: str, key: tuple) -> str:
+        digest = hashlib.md5(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.root, namespace, f"{digest}.pkl")
+
+    def get(self, namespace: str, key: tuple, ttl: int) -> Any | None:
+        with self._lock:
+            entry = self._memory.get((namespace, key))
+        if entry is not None and time.time() - entry[0] <= ttl:
+            return entry[1]
+
+        path = self._path(namespace, key)
+        try:
+            # 파일 수정 시각을 저장 시각으로 사용
+            stored_at = os.path.getmtime(path)
+            if time.time() - stored_at > ttl:
+                # 같은 항목을 더 긴 TTL로 다시 읽을 수 있으므로(만료된 환율 대체 등) 파일은 정리 단계에서만 삭제
+                return None
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            with self._lock:
+                self._memory[(namespace, key)] = (stored_at, value)
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # 손상된 파일 등은 캐시 미스로 처리
+            logger.warning(f"파일 캐시 읽기 실패 ({namespace}, {key}): {e}")
+            return None
+
+    def set(self, namespace: str, key: tuple, value: Any) -> None:
+        with self._lock:
+            self._memory[(namespace, key)] = (time.time(), value)
+        path = self._path(namespace, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 동시에 읽는 요청이 쓰다 만 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except Exception as e:
+            logger.warning(f"파일 캐시 저장 실패 ({namespace}, {key}): {e}")
+            return
+        self._prune()
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            # 다른 스레드가 먼저 지운 경우 등은 무시
+            pass
+
+    def _prune(self) -> None:
+        """최대 보관 기간이 지난 파일을 삭제하고, 남은 항목 수가 상한을 넘으면 수정 시각이 오래된 파일부터 삭제"""
+        entries = []
+        try:
+            for namespace_dir in os.scandir(self.root):
+                if not namespace_dir.is_dir():
+                    continue
+                for entry in os.scandir(namespace_dir.path):
+                    if entry.name.endswith('.pkl'):
+                        try:
+                            entries.append((entry.stat().st_mtime, entry.path))
+                        except OSError:
+                            continue
+        except OSError as e:
+            logger.warning(f"파일 캐시 정리 실패 ({self.root}): {e}")
+            return
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age
+            for _, path in (e for e in entries if e[0] < cutoff):
+                self._remove(path)
+            entries = [e for e in entries if e[0] >= cutoff]
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+        entries.sort()
+        for _, path in entries[:excess]:
+            self._remove(path)
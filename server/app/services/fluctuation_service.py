@@ -5,6 +5,7 @@ import logging
 from typing import List, Dict, Tuple
 from datetime import datetime, timedelta
 import time
+from .market_lookup import market_tickers_and_names, stock_listing
 
 logger = logging.getLogger(__name__)
 
@@ -13,11 +14,11 @@ class FluctuationService:
         try:
             if market in ["KOSPI", "KOSDAQ"]:
                 today_str = datetime.now().strftime('%Y%m%d')
-                tickers = stock.get_market_ticker_list(market=market, date=today_str)
-                return [(t, stock.get_market_ticker_name(t)) for t in tickers if len(t) == 6 and t.isdigit()]
+                # 종목별 이름 조회 대신 전 종목 (티커, 종목명)을 한 번에 조회
+                names = market_tickers_and_names(market, today_str)
+                return [(t, n) for t, n in zip(names.index.tolist(), names.tolist()) if len(t) == 6 and t.isdigit()]
             elif market in ['NASDAQ', 'NYSE', 'S&P500']:
-                import FinanceDataReader as fdr
-                df = fdr.StockListing(market)
+                df = stock_listing(market)
                 return list(df[['Symbol', 'Name']].itertuples(index=False, name=None))
             return []
         except Exception as e:
@@ -1,29 +1,36 @@
 import pandas as pd
+import numpy as np
 import time
 from pykrx import stock
 import logging
 from typing import List, Dict, Set, Tuple
 from datetime import datetime, timedelta
 from ..core.sector_data import SECTOR_GROUPS
+from .market_lookup import index_ticker_name, index_portfolio
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# 섹터 구성 종목 OHLCV를 동시에 조회할 최대 작업 수
+_OHLCV_FETCH_WORKERS = 12
+
 class PyKRXService:
     def get_sector_groups(self) -> Dict:
         return SECTOR_GROUPS
 
     def get_tickers_by_group(self, market: str, group: str) -> List[tuple[str, str]]:
         tickers = stock.get_index_ticker_list(market=market) if group == '전체 보기' else SECTOR_GROUPS.get(market, {}).get(group, [])
-        return [(t, stock.get_index_ticker_name(t)) for t in tickers if t]
+        return [(t, index_ticker_name(t)) for t in tickers if t]
 
 
     def analyze_sector_performance(self, start_date: str, end_date: str, tickers: List[str]) -> List[Dict]:
         latest_business_day = None
         end_date_dt = datetime.strptime(end_date, "%Y%m%d")
-        for i in range(7):
-            check_date_str = (end_date_dt - timedelta(days=i)).strftime("%Y%m%d")
+        # 주말은 항상 휴장이므로 조회하지 않고, 최근 7일 중 평일(공휴일일 수 있음)만 최신 순으로 확인
+        for check_day in pd.bdate_range(end_date_dt - timedelta(days=6), end_date_dt)[::-1]:
+            check_date_str = check_day.strftime("%Y%m%d")
             try:
-                if tickers and stock.get_index_portfolio_deposit_file(tickers[0], check_date_str):
+                if tickers and index_portfolio(tickers[0], check_date_str):
                     latest_business_day = check_date_str
                     break
             except (ValueError, TypeError, KeyError):
@@ -36,8 +43,8 @@ class PyKRXService:
 
         for sector_ticker in tickers:
             try:
-                sector_name = stock.get_index_ticker_name(sector_ticker)
-                constituent_stocks = stock.get_index_portfolio_deposit_file(sector_ticker, latest_business_day)
+                sector_name = index_ticker_name(sector_ticker)
+                constituent_stocks = index_portfolio(sector_ticker, latest_business_day)
                 all_constituent_stocks[sector_name] = constituent_stocks
                 unique_stock_tickers.update(constituent_stocks)
                 time.sleep(0.1)
@@ -45,37 +52,54 @@ class PyKRXService:
         
         if not unique_stock_tickers: return []
 
-        all_stock_data: Dict[str, pd.Series] = {}
-        for stock_ticker in list(unique_stock_tickers):
+        def fetch_close(stock_ticker: str) -> Tuple[str, pd.Series | None]:
             try:
                 df = stock.get_market_ohlcv(start_date, end_date, stock_ticker)
-                if not df.empty: all_stock_data[stock_ticker] = df['종가']
-                time.sleep(0.1)
-            except Exception: continue
+                return stock_ticker, None if df.empty else df['종가']
+            except Exception:
+                return stock_ticker, None
+
+        # 종목별 조회는 I/O 대기가 대부분이므로 병렬로 실행 (작업 수가 곧 요청 속도 제한)
+        with ThreadPoolExecutor(max_workers=_OHLCV_FETCH_WORKERS) as executor:
+            # 기준 날짜 인덱스(삼성전자)도 구성 종목 조회와 동시에 요청
+            baseline_future = executor.submit(stock.get_market_ohlcv, start_date, end_date, "005930")
+            all_stock_data: Dict[str, pd.Series] = {
+                t: close for t, close in executor.map(fetch_close, unique_stock_tickers) if close is not None
+            }
         
         try:
-            all_dates = stock.get_market_ohlcv(start_date, end_date, "005930").index
-            sector_indexed_returns_df = pd.DataFrame(index=all_dates)
+            all_dates = baseline_future.result().index
         except Exception: return []
 
+        if not all_stock_data: return []
+        # 종목별 종가를 한 번만 정렬해 넓은 표(열 = 종목)로 만들고, 섹터별 평균은 열 선택으로 계산
+        wide = pd.concat(all_stock_data, axis=1)
+        sector_results: Dict[str, pd.Series] = {}
+
         for sector_name, stock_list in all_constituent_stocks.items():
-            sector_prices = [all_stock_data[ticker] for ticker in stock_list if ticker in all_stock_data and not all_stock_data[ticker].empty]
+            cols = [ticker for ticker in stock_list if ticker in all_stock_data]
             
-            if sector_prices:
-                temp_df = pd.concat(sector_prices, axis=1)
-                daily_avg_price = temp_df.mean(axis=1)
+            if cols:
+                daily_avg_price = wide[cols].mean(axis=1)
                 
-                first_valid_price = daily_avg_price.dropna().iloc[0] if not daily_avg_price.dropna().empty else 0
+                first_valid_date = daily_avg_price.first_valid_index()
+                first_valid_price = daily_avg_price.loc[first_valid_date] if first_valid_date is not None else 0
                 if first_valid_price > 0:
-                    indexed_series = (daily_avg_price / first_valid_price) * 100
-                    sector_indexed_returns_df[sector_name] = indexed_series
+                    sector_results[sector_name] = (daily_avg_price / first_valid_price) * 100
 
+        if not sector_results: return []
+        # 모든 섹터 시리즈가 wide와 같은 인덱스를 공유하므로 정렬 없이 이어 붙인 뒤,
+        # 기준 날짜로는 표 전체를 한 번만 reindex하고 결측일은 직전 값으로 채움
+        sector_indexed_returns_df = pd.concat(sector_results, axis=1).reindex(all_dates).ffill()
         if sector_indexed_returns_df.empty: return []
             
-        sector_indexed_returns_df.ffill(inplace=True)
-        sector_indexed_returns_df.index = sector_indexed_returns_df.index.strftime('%Y-%m-%d')
-        result_json = sector_indexed_returns_df.where(pd.notnull(sector_indexed_returns_df), None).to_dict(orient='index')
-        return [{"date": date, **data} for date, data in result_json.items()]
+        dates = sector_indexed_returns_df.index.strftime('%Y-%m-%d').tolist()
+        sector_names = sector_indexed_returns_df.columns.tolist()
+        # 셀 단위 where/to_dict 대신 NumPy 배열에서 NaN만 None으로 바꾼 뒤 한 번에 파이썬 값으로 변환
+        values = sector_indexed_returns_df.to_numpy(dtype=np.float64)
+        cells = values.astype(object)
+        cells[np.isnan(values)] = None
+        return [{"date": date, **dict(zip(sector_names, row))} for date, row in zip(dates, cells.tolist())]
         
     def get_trading_performance_by_investor(self, start_date: str, end_date: str, ticker: str, detail: bool, institution_only: bool) -> pd.DataFrame:
         logger.info(f"거래 실적 조회: {start_date}~{end_date}, Ticker: {ticker}, Detail: {detail}, InstitutionOnly: {institution_only}")
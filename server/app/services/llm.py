@@ -1,22 +1,62 @@
 import openai
-from typing import List, Dict, Any # Any 임포트 추가
+import orjson
+from typing import AsyncIterator, List, Dict, Any # Any 임포트 추가
 import re # 정규식 모듈 임포트
+import logging
 from ..config import Settings
 
+logger = logging.getLogger(__name__)
+
+_SYSTEM_PROMPT = "당신은 유능한 주식 분석 AI 'David'입니다. 제공된 데이터를 기반으로 명확하고 통찰있게 답변해주세요."
+
+# 주가 히스토리는 최근 거래일만 일별로 보내고, 그 이전은 월별 요약으로 줄여 토큰 수를 제한
+_RECENT_HISTORY_DAYS = 60
+
+def _compact_history(history_data: str) -> str:
+    """일별 주가 JSON이 길면 최근 거래일은 그대로 두고 이전 기간은 월별(시가·고가·저가·종가·거래량 합계)로 요약"""
+    try:
+        rows = orjson.loads(history_data)
+        if not isinstance(rows, list) or len(rows) <= _RECENT_HISTORY_DAYS:
+            return history_data
+        rows = sorted(rows, key=lambda r: r["Date"])
+        monthly: Dict[str, Dict[str, Any]] = {}
+        for row in rows[:-_RECENT_HISTORY_DAYS]:
+            month = row["Date"][:7]
+            summary = monthly.get(month)
+            if summary is None:
+                monthly[month] = {"Month": month, "Open": row["Open"], "High": row["High"], "Low": row["Low"], "Close": row["Close"], "Volume": row["Volume"]}
+            else:
+                summary["High"] = max(summary["High"], row["High"])
+                summary["Low"] = min(summary["Low"], row["Low"])
+                summary["Close"] = row["Close"]
+                summary["Volume"] += row["Volume"]
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        # 예상한 형식이 아니면 원문을 그대로 사용
+        return history_data
+    return (
+        f"월별 요약 {orjson.dumps(list(monthly.values())).decode()} / "
+        f"최근 {_RECENT_HISTORY_DAYS}거래일 {orjson.dumps(rows[-_RECENT_HISTORY_DAYS:]).decode()}"
+    )
+
 class LLMService:
     def __init__(self, settings: Settings):
         self.client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
     def _make_prompt(self, symbol: str, user_question: str, financial_data: str, history_data: str, news_data: List[Dict]) -> List[Dict[str, str]]:
         news_string = "\n".join([f"- {item['title']}" for item in news_data]) if news_data else "제공된 뉴스 데이터 없음"
-        system_message_content = f"""
-        당신은 유능한 주식 분석 AI 'David'입니다. 제공된 데이터를 기반으로 명확하고 통찰있게 답변해주세요.
+        context_content = f"""
         - 분석 대상: {symbol}
         - 재무 데이터: {financial_data}
-        - 주가 히스토리: {history_data}
+        - 주가 히스토리: {_compact_history(history_data)}
         - 최신 뉴스: {news_string}
         """
-        return [{"role": "system", "content": system_message_content}, {"role": "user", "content": user_question}]
+        # 변하지 않는 지시문을 맨 앞에 두고 종목 데이터와 질문을 뒤에 붙여, 같은 종목의 후속 질문은
+        # 지시문 + 데이터까지의 앞부분이 동일해 OpenAI의 자동 프롬프트 캐싱이 적용되도록 구성
+        return [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": context_content},
+            {"role": "user", "content": user_question}
+        ]
 
     async def get_qa_response(self, symbol: str, user_question: str, financial_data: str, history_data: str, news_data: List[dict]) -> str:
         messages = self._make_prompt(symbol, user_question, financial_data, history_data, news_data)
@@ -29,5 +69,33 @@ class LLMService:
             )
             return response.choices[0].message.content.strip()
         except openai.APIError as e:
-            print(f"OpenAI API 오류: {e}")
+            logger.error(f"OpenAI API 오류: {e}")
             raise e # 예외를 다시 발생시켜 상위 핸들러가 처리하도록 함
+
+    async def stream_qa_response(self, symbol: str, user_question: str, financial_data: str, history_data: str, news_data: List[dict]) -> AsyncIterator[str]:
+        """답변을 생성되는 대로 텍스트 조각 단위로 반환 (첫 응답까지의 대기 시간 단축)
+
+        요청 자체의 오류(인증, 한도 초과 등)는 스트림을 열 때 바로 발생하므로 응답을 시작하기 전에 처리할 수 있습니다.
+        """
+        messages = self._make_prompt(symbol, user_question, financial_data, history_data, news_data)
+        try:
+            stream = await self.client.chat.completions.create(
+                model="gpt-4o",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=700,
+                stream=True
+            )
+        except openai.APIError as e:
+            logger.error(f"OpenAI API 오류: {e}")
+            raise e
+
+        async def deltas() -> AsyncIterator[str]:
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                # 중간에 소비를 멈춰도(클라이언트 연결 종료 등) OpenAI 응답 연결을 바로 닫아 생성을 중단
+                await stream.close()
+        return deltas()
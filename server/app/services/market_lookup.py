@@ -0,0 +1,62 @@
+import pandas as pd
+from pykrx import stock
+from pykrx.website import krx
+from cachetools import TTLCache
+from functools import lru_cache
+from datetime import datetime
+import threading
+
+# 종목/지수 이름은 거의 바뀌지 않으므로 프로세스 단위로 캐시 (요청마다 외부 조회 방지)
+@lru_cache(maxsize=4096)
+def index_ticker_name(ticker: str) -> str:
+    return stock.get_index_ticker_name(ticker)
+
+@lru_cache(maxsize=4096)
+def market_ticker_name(ticker: str) -> str:
+    return stock.get_market_ticker_name(ticker)
+
+# 지수 구성 종목은 기준일이 같으면 변하지 않으므로 (지수, 날짜) 키로 24시간 캐시
+_portfolio_cache = TTLCache(maxsize=1024, ttl=86400)
+# 상장 종목 목록은 하루 단위로 캐시
+_listing_cache = TTLCache(maxsize=16, ttl=86400)
+# TTLCache는 스레드 안전하지 않으므로 스레드풀에서 호출될 때를 대비해 보호
+_lock = threading.Lock()
+
+def index_portfolio(ticker: str, date: str) -> list:
+    key = (ticker, date)
+    with _lock:
+        cached = _portfolio_cache.get(key)
+    if cached is not None:
+        return cached
+    constituents = stock.get_index_portfolio_deposit_file(ticker, date)
+    # 비어있는 결과(휴장일, 아직 집계 전인 당일 등)는 나중에 채워질 수 있으므로 캐시하지 않음
+    if len(constituents):
+        with _lock:
+            _portfolio_cache[key] = constituents
+    return constituents
+
+def market_tickers_and_names(market: str, date: str) -> pd.Series:
+    """해당 날짜의 시장 전 종목 (티커 → 종목명)을 한 번의 요청으로 조회해 캐시"""
+    key = ('krx', market, date)
+    with _lock:
+        cached = _listing_cache.get(key)
+    if cached is None:
+        # stock.get_market_ticker_list도 내부적으로 같은 요청을 보내지만 종목명을 버리므로 직접 호출
+        cached = krx.get_market_ticker_and_name(date, market)
+        if len(cached):
+            with _lock:
+                _listing_cache[key] = cached
+    return cached.copy()
+
+def stock_listing(market: str) -> pd.DataFrame:
+    """FinanceDataReader 상장 종목 목록을 (시장, 날짜) 단위로 캐시해서 반환"""
+    import FinanceDataReader as fdr
+    key = (market, datetime.now().strftime('%Y%m%d'))
+    with _lock:
+        cached = _listing_cache.get(key)
+    if cached is None:
+        cached = fdr.StockListing(market)
+        with _lock:
+            _listing_cache[key] = cached
+    # 호출 측에서 수정해도 캐시가 오염되지 않도록 복사본 반환
+    return cached.copy()
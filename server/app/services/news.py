@@ -1,39 +1,94 @@
 import httpx
-import xml.etree.ElementTree as ET
-from datetime import datetime, timezone
+import asyncio
+import io
+from lxml import etree
+from email.utils import parsedate_to_datetime
+from datetime import timezone
+from typing import Dict, List
+from cachetools import LRUCache, TTLCache
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# ✅ 실제 브라우저처럼 보이도록 User-Agent 헤더를 더 구체적으로 설정
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
 class NewsService:
+    def __init__(self):
+        # 요청마다 연결을 새로 맺지 않도록 프로세스 동안 하나의 클라이언트(연결 풀)를 재사용
+        self._client = httpx.AsyncClient(headers=_HEADERS, timeout=15, follow_redirects=True)
+        # 파싱한 뉴스 목록을 (종목, 개수) 단위로 5분간 캐시 (이벤트 루프 안에서만 접근하므로 잠금 불필요)
+        self._news_cache = TTLCache(maxsize=512, ttl=300)
+        # 피드 URL별 (검증 헤더, 원본 본문): 캐시가 만료된 뒤에도 조건부 요청으로 변경 여부만 확인
+        self._feed_validators = LRUCache(maxsize=256)
+
+    async def close(self) -> None:
+        """앱 종료 시 연결 풀을 정리합니다."""
+        await self._client.aclose()
+
     async def get_yahoo_rss_news(self, symbol: str, limit: int = 10) -> list:
+        return await self._fetch_one(symbol, limit)
+
+    async def get_news_for_symbols(self, symbols: List[str], limit: int = 10) -> Dict[str, list]:
+        """여러 종목의 뉴스를 공유 클라이언트로 동시에 조회"""
+        results = await asyncio.gather(*(self._fetch_one(s, limit) for s in symbols))
+        return dict(zip(symbols, results))
+
+    async def _fetch_one(self, symbol: str, limit: int) -> list:
+        cache_key = (symbol.upper(), limit)
+        cached = self._news_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        news_list = await self._fetch_and_parse(symbol, limit)
+        # 실패하거나 비어있는 결과는 다음 요청에서 다시 시도하도록 캐시하지 않음
+        if news_list:
+            self._news_cache[cache_key] = news_list
+        return news_list
+
+    async def _get_feed(self, url: str, symbol: str) -> bytes:
+        """ETag/Last-Modified로 조건부 요청을 보내고, 304(변경 없음)이면 저장해 둔 본문을 재사용합니다."""
+        stored = self._feed_validators.get(url)
+        headers = stored[0] if stored else None
+        response = await self._client.get(url, headers=headers)
+
+        logger.debug("뉴스 서비스 '%s': 응답 상태 코드 %s", symbol, response.status_code)
+
+        if response.status_code == 304 and stored:
+            return stored[1]
+
+        # ✅ 요청이 성공했는지 확인
+        response.raise_for_status()
+
+        validators = {}
+        if etag := response.headers.get('ETag'):
+            validators['If-None-Match'] = etag
+        if last_modified := response.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = last_modified
+        if validators:
+            self._feed_validators[url] = (validators, response.content)
+        return response.content
+
+    async def _fetch_and_parse(self, symbol: str, limit: int) -> list:
         url = f"https://finance.yahoo.com/rss/headline?s={symbol.upper()}"
-        # ✅ 실제 브라우저처럼 보이도록 User-Agent 헤더를 더 구체적으로 설정
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
         news_list = []
 
-        logger.info(f"뉴스 서비스 시작: '{symbol}', URL: {url}")
+        # 요청마다 남는 진행 로그는 운영 환경에서 출력되지 않도록 DEBUG 레벨로 기록
+        # (% 인자 방식이라 DEBUG가 꺼져 있으면 메시지 문자열도 만들지 않음)
+        logger.debug("뉴스 서비스 시작: '%s', URL: %s", symbol, url)
 
         try:
-            async with httpx.AsyncClient() as client:
-                # ✅ Follow redirects and set a reasonable timeout
-                response = await client.get(url, headers=headers, timeout=15, follow_redirects=True)
-            
-            logger.info(f"뉴스 서비스 '{symbol}': 응답 상태 코드 {response.status_code}")
-
-            # ✅ 요청이 성공했는지 확인
-            response.raise_for_status()
+            content = await self._get_feed(url, symbol)
 
-            root = ET.fromstring(response.content)
+            # 필요한 개수(limit)만큼의 <item>만 순차 파싱하고, 나머지 문서는 읽지 않음
+            # (recover=True: 피드 일부가 깨져 있어도 그 앞까지의 <item>은 살려서 반환)
+            context = etree.iterparse(io.BytesIO(content), events=('end',), tag='item', recover=True)
             
             item_count = 0
-            for item in root.findall('./channel/item'):
-                if len(news_list) >= limit:
-                    break
-                
+            for _, item in context:
                 item_count += 1
                 title = item.findtext('title', 'N/A')
                 pub_date_str = item.findtext('pubDate', None)
@@ -42,7 +97,10 @@ class NewsService:
                 if pub_date_str:
                     try:
                         # RFC 822 형식을 파싱
-                        dt_object = datetime.strptime(pub_date_str, '%a, %d %b %Y %H:%M:%S %z')
+                        dt_object = parsedate_to_datetime(pub_date_str)
+                        # '-0000'(시간대 미상)은 시간대 없는 값으로 파싱되므로 UTC로 간주해 항상 오프셋을 포함
+                        if dt_object.tzinfo is None:
+                            dt_object = dt_object.replace(tzinfo=timezone.utc)
                         published_date_iso = dt_object.isoformat()
                     except (ValueError, TypeError) as e:
                         logger.warning(f"뉴스 날짜 파싱 오류: '{pub_date_str}', 에러: {e}")
@@ -55,8 +113,12 @@ class NewsService:
                     "source": "Yahoo Finance RSS",
                     "summary": item.findtext('description', '')
                 })
+                # 처리한 <item>은 메모리에서 해제
+                item.clear()
+                if len(news_list) >= limit:
+                    break
 
-            logger.info(f"뉴스 서비스 '{symbol}': 총 {item_count}개 아이템 발견, {len(news_list)}개 처리 완료.")
+            logger.debug("뉴스 서비스 '%s': 총 %d개 아이템 발견, %d개 처리 완료.", symbol, item_count, len(news_list))
             
             if item_count == 0:
                 logger.warning(f"뉴스 서비스 '{symbol}': XML 데이터에서 <item> 태그를 찾지 못했습니다. 응답 구조가 변경되었거나 내용이 비어있을 수 있습니다.")
@@ -69,7 +131,7 @@ class NewsService:
         except httpx.HTTPStatusError as e:
             logger.error(f"뉴스 서비스 '{symbol}': 야후 파이낸스에서 에러 응답: 상태 코드 {e.response.status_code}", exc_info=True)
             return []
-        except ET.ParseError as e:
+        except etree.XMLSyntaxError as e:
             logger.error(f"뉴스 서비스 '{symbol}': XML 파싱 에러: {e}", exc_info=True)
             return []
         except Exception as e:
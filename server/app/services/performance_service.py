@@ -1,26 +1,44 @@
 import pandas as pd
+import numpy as np
 import yfinance as yf
 from pykrx import stock
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import time
+from .market_lookup import market_tickers_and_names, stock_listing
 
 logger = logging.getLogger(__name__)
 
+# 한국 주식 종목별 조회 시 동시에 실행할 최대 작업 수 (pykrx 요청 폭주 방지)
+_KR_FETCH_WORKERS = 16
+
+def _smallest_k(values: np.ndarray, k: int) -> np.ndarray:
+    """값이 작은 순으로 k개의 위치를 반환 (동률은 행 순서가 앞선 것을 먼저 선택·배치)"""
+    n = len(values)
+    if k < n:
+        # 전체 정렬 대신 k번째 값만 구한 뒤, 경계값과 같은 행은 행 순서대로 남은 자리만큼 채움
+        kth = np.partition(values, k - 1)[k - 1]
+        below = np.flatnonzero(values < kth)
+        ties = np.flatnonzero(values == kth)[:k - len(below)]
+        idx = np.concatenate([below, ties])
+    else:
+        idx = np.arange(n)
+    return idx[np.lexsort((idx, values[idx]))]
+
 class PerformanceService:
     def _get_tickers_by_market(self, market: str) -> pd.DataFrame:
         """시장의 티커와 이름 목록을 가져옵니다."""
         try:
             if market in ["KOSPI", "KOSDAQ"]:
                 today_str = datetime.now().strftime('%Y%m%d')
-                tickers = stock.get_market_ticker_list(market=market, date=today_str)
-                valid_tickers = [t for t in tickers if len(t) == 6 and t.isdigit()]
-                names = [stock.get_market_ticker_name(t) for t in valid_tickers]
-                df = pd.DataFrame({'ticker': valid_tickers, 'name': names})
+                # 종목별 이름 조회 대신 전 종목 (티커, 종목명)을 한 번에 조회
+                names = market_tickers_and_names(market, today_str)
+                valid = [(t, n) for t, n in zip(names.index.tolist(), names.tolist()) if len(t) == 6 and t.isdigit()]
+                df = pd.DataFrame(valid, columns=['ticker', 'name'])
             elif market in ['NASDAQ', 'NYSE', 'S&P500']:
-                import FinanceDataReader as fdr
-                df = fdr.StockListing(market)
+                df = stock_listing(market)
                 df = df[['Symbol', 'Name']].rename(columns={'Symbol': 'ticker', 'Name': 'name'})
             else:
                 df = pd.DataFrame()
@@ -29,30 +47,45 @@ class PerformanceService:
             logger.error(f"'{market}' 티커 목록 조회 실패: {e}")
             return pd.DataFrame()
 
+    def _performance_from_closes(self, close_prices: pd.DataFrame, name_map: Dict[str, str]) -> pd.DataFrame:
+        """종가 표(행 = 날짜, 열 = 종목)에서 기간 수익률을 한 번에 계산합니다."""
+        # 종목마다 첫/마지막 유효 종가를 사용 (상장·거래정지 등으로 빈 날짜가 있어도 처리)
+        start_prices = close_prices.bfill().iloc[0].to_numpy(dtype=np.float64)
+        end_prices = close_prices.ffill().iloc[-1].to_numpy(dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            perf = np.where(start_prices > 0, ((end_prices - start_prices) / start_prices) * 100, np.nan)
+        valid = ~np.isnan(perf)
+        tickers = close_prices.columns[valid].tolist()
+        return pd.DataFrame({
+            "ticker": tickers,
+            "name": [name_map.get(t, t) for t in tickers],
+            "performance": perf[valid]
+        })
+
+    def _fetch_close_kr(self, ticker: str, start: str, end: str) -> Optional[pd.Series]:
+        """한국 주식 한 종목의 기간 종가를 조회합니다. (실패하거나 데이터가 부족하면 None)"""
+        try:
+            df = stock.get_market_ohlcv(start, end, ticker)
+            if not df.empty and len(df) > 1:
+                return df['종가']
+        except Exception:
+            pass
+        return None
+
     def _get_performance_kr(self, tickers: List[str], name_map: Dict[str, str], start_date: str, end_date: str) -> pd.DataFrame:
         """한국 주식의 수익률을 계산합니다."""
-        performance_data = []
-        # 한국 주식은 개별 조회가 더 안정적이므로 기존 로직 유지
-        for ticker in tickers:
-            try:
-                df = stock.get_market_ohlcv(start_date.replace('-', ''), end_date.replace('-', ''), ticker)
-                if not df.empty and len(df) > 1:
-                    start_price = df['종가'].iloc[0]
-                    end_price = df['종가'].iloc[-1]
-                    if start_price > 0:
-                        performance = ((end_price - start_price) / start_price) * 100
-                        performance_data.append({
-                            "ticker": ticker,
-                            "name": name_map.get(ticker, ticker),
-                            "performance": performance
-                        })
-            except Exception:
-                continue
-        return pd.DataFrame(performance_data)
+        # 한국 주식은 개별 조회가 더 안정적이므로 종목별로 조회하되, I/O 대기 시간을 겹치도록 병렬 실행
+        start, end = start_date.replace('-', ''), end_date.replace('-', '')
+        with ThreadPoolExecutor(max_workers=_KR_FETCH_WORKERS) as executor:
+            closes = executor.map(lambda t: self._fetch_close_kr(t, start, end), tickers)
+            close_by_ticker = {t: c for t, c in zip(tickers, closes) if c is not None}
+        if not close_by_ticker:
+            return pd.DataFrame()
+        return self._performance_from_closes(pd.concat(close_by_ticker, axis=1), name_map)
 
     def _get_performance_us(self, tickers: List[str], name_map: Dict[str, str], start_date: str, end_date: str) -> pd.DataFrame:
         """미국 주식의 수익률을 계산합니다."""
-        all_performance_data = []
+        chunk_frames = []
         # ✅ [성능 개선] API Rate Limit을 피하기 위해 200개씩 나누어 요청 (배치 처리)
         chunk_size = 200
         for i in range(0, len(tickers), chunk_size):
@@ -67,25 +100,16 @@ class PerformanceService:
                 if close_prices.empty or len(close_prices) < 2:
                     continue
 
-                start_prices = close_prices.bfill().iloc[0]
-                end_prices = close_prices.ffill().iloc[-1]
-                
-                perf_series = ((end_prices - start_prices) / start_prices) * 100
-                
-                for ticker, performance in perf_series.items():
-                    if pd.notna(performance):
-                         all_performance_data.append({
-                            "ticker": ticker,
-                            "name": name_map.get(ticker, ticker),
-                            "performance": performance
-                        })
+                chunk_frames.append(self._performance_from_closes(close_prices, name_map))
 
                 time.sleep(0.5) # 요청 사이에 약간의 딜레이를 줌
             except Exception as e:
                 logger.warning(f"Ticker chunk {i}-{i+chunk_size} 다운로드 중 오류: {e}")
                 continue
         
-        return pd.DataFrame(all_performance_data)
+        if not chunk_frames:
+            return pd.DataFrame()
+        return pd.concat(chunk_frames, ignore_index=True)
 
 
     def get_market_performance(self, market: str, start_date: str, end_date: str, top_n: int) -> Dict:
@@ -97,7 +121,8 @@ class PerformanceService:
             return {"top_performers": [], "bottom_performers": []}
 
         tickers = listing['ticker'].tolist()
-        name_map = listing.set_index('ticker')['name'].to_dict()
+        # 중간 Series/Index를 만들지 않고 바로 dict 생성
+        name_map = dict(zip(tickers, listing['name'].tolist()))
 
         if market in ["KOSPI", "KOSDAQ"]:
             performance_df = self._get_performance_kr(tickers, name_map, start_date, end_date)
@@ -107,9 +132,12 @@ class PerformanceService:
         if performance_df.empty:
             return {"top_performers": [], "bottom_performers": []}
 
-        performance_df = performance_df.sort_values(by='performance', ascending=False)
+        # 전체 정렬 대신 상위/하위 N개만 선택한 뒤, 선택된 N개만 정렬
+        perf = performance_df['performance'].to_numpy()
+        top_idx = _smallest_k(-perf, top_n)
+        bottom_idx = _smallest_k(perf, top_n)
         
-        top_performers = performance_df.head(top_n).to_dict('records')
-        bottom_performers = performance_df.tail(top_n).sort_values(by='performance', ascending=True).to_dict('records')
+        top_performers = performance_df.iloc[top_idx].to_dict('records')
+        bottom_performers = performance_df.iloc[bottom_idx].to_dict('records')
         
         return {"top_performers": top_performers, "bottom_performers": bottom_performers}
\ No newline at end of file
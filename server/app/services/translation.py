@@ -1,11 +1,134 @@
 from deep_translator import GoogleTranslator
+from cachetools import TTLCache
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import threading
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 여러 문장을 번역할 때 동시에 보낼 최대 요청 수
+_MAX_TRANSLATE_WORKERS = 8
+# 여러 요청이 동시에 들어와도 번역 API로 나가는 전체 동시 호출 수를 제한
+_translate_slots = threading.BoundedSemaphore(_MAX_TRANSLATE_WORKERS)
+# 짧은 문장 여러 개는 구분자로 이어 한 번의 요청으로 번역 (Google 번역 요청당 5000자 제한 이내로 묶음)
+_BATCH_SEPARATOR = "\n<<<SEP>>>\n"
+# 번역 과정에서 구분자의 공백·줄바꿈이 바뀌어도 나눌 수 있도록 느슨하게 매칭
+_BATCH_SEPARATOR_RE = re.compile(r"\s*<<<\s*SEP\s*>>>\s*")
+_MAX_BATCH_CHARS = 4500
+# Cloud Translation v2 REST API (API 키가 설정된 경우에만 사용, 요청당 최대 128개 문장)
+_GOOGLE_TRANSLATE_V2_URL = "https://translation.googleapis.com/language/translate/v2"
+_MAX_BATCH_ITEMS = 128
 
 class TranslationService:
-    def translate_to_korean(self, text: str) -> str:
-        if not text:
-            return ""
+    def __init__(self, api_key: str | None = None):
+        # 기업 소개 등 자주 바뀌지 않는 문장의 번역 결과 캐시 (24시간 TTL)
+        self._cache = TTLCache(maxsize=4096, ttl=86400)
+        # 스레드풀에서 동시에 호출되므로 캐시 접근을 보호
+        self._lock = threading.Lock()
+        # API 키가 있으면 공식 REST API로 묶음을 한 번에 번역하고, 연결 풀을 재사용
+        # (키는 URL 대신 헤더로 보내 오류 로그에 남지 않도록 함)
+        self._http = httpx.Client(
+            headers={"X-Goog-Api-Key": api_key},
+            timeout=10, limits=httpx.Limits(max_connections=_MAX_TRANSLATE_WORKERS)
+        ) if api_key else None
+
+    def close(self) -> None:
+        """앱 종료 시 연결 풀을 정리합니다."""
+        if self._http is not None:
+            self._http.close()
+
+    def _translate_rest(self, batch: List[str]) -> List[str] | None:
+        """Cloud Translation v2 API로 여러 문장을 한 번의 요청(q 배열)으로 번역 (실패 시 None)"""
+        try:
+            with _translate_slots:
+                response = self._http.post(
+                    _GOOGLE_TRANSLATE_V2_URL,
+                    json={"q": batch, "target": "ko", "format": "text"}
+                )
+            response.raise_for_status()
+            parts = [t["translatedText"] for t in response.json()["data"]["translations"]]
+        except Exception as e:
+            logger.warning(f"번역 API 요청 실패, 기본 번역기로 전환: {e}")
+            return None
+        if len(parts) != len(batch):
+            return None
+        with self._lock:
+            for text, part in zip(batch, parts):
+                if part:
+                    self._cache[text] = part
+        return parts
+
+    def _translate(self, text: str) -> str:
         try:
-            return GoogleTranslator(source='auto', target='ko').translate(text)
+            with _translate_slots:
+                translated = GoogleTranslator(source='auto', target='ko').translate(text)
         except Exception as e:
-            print(f"번역 실패: {e}")
-            return f"(번역 실패) {text}"
\ No newline at end of file
+            logger.warning(f"번역 실패: {e}")
+            return f"(번역 실패) {text}"
+        # 성공한 비어있지 않은 번역만 캐시
+        if translated:
+            with self._lock:
+                self._cache[text] = translated
+        return translated
+
+    def _translate_joined(self, batch: List[str]) -> List[str] | None:
+        """여러 문장을 구분자로 이어 한 번에 번역 (결과를 원래 개수로 나누지 못하면 None)"""
+        try:
+            with _translate_slots:
+                translated = GoogleTranslator(source='auto', target='ko').translate(_BATCH_SEPARATOR.join(batch))
+        except Exception as e:
+            logger.warning(f"묶음 번역 실패, 문장별 번역으로 전환: {e}")
+            return None
+        parts = _BATCH_SEPARATOR_RE.split(translated.strip()) if translated else []
+        if len(parts) != len(batch):
+            return None
+        with self._lock:
+            for text, part in zip(batch, parts):
+                if part:
+                    self._cache[text] = part
+        return parts
+
+    def _translate_batch(self, batch: List[str]) -> List[str]:
+        if self._http is not None:
+            parts = self._translate_rest(batch)
+            if parts is not None:
+                return parts
+        if len(batch) > 1:
+            parts = self._translate_joined(batch)
+            if parts is not None:
+                return parts
+        return [self._translate(t) for t in batch]
+
+    def translate_many(self, texts: List[str]) -> List[str]:
+        """여러 문장을 한 번에 번역 (중복 제거 후 캐시에 없는 문장만 병렬로 번역)"""
+        unique = [t for t in dict.fromkeys(texts) if t]
+        results: Dict[str, str] = {}
+        with self._lock:
+            for t in unique:
+                cached = self._cache.get(t)
+                if cached is not None:
+                    results[t] = cached
+        misses = [t for t in unique if t not in results]
+        # 캐시에 없는 문장을 글자 수 제한 안에서 묶고, 묶음이 여러 개면 병렬로 요청
+        # (deep_translator의 translate_batch는 내부적으로 한 문장씩 순차 요청하므로 사용하지 않음)
+        batches: List[List[str]] = []
+        size = 0
+        for t in misses:
+            if not batches or size + len(t) + len(_BATCH_SEPARATOR) > _MAX_BATCH_CHARS or len(batches[-1]) >= _MAX_BATCH_ITEMS:
+                batches.append([])
+                size = 0
+            batches[-1].append(t)
+            size += len(t) + len(_BATCH_SEPARATOR)
+        if len(batches) == 1:
+            results.update(zip(batches[0], self._translate_batch(batches[0])))
+        elif batches:
+            with ThreadPoolExecutor(max_workers=min(_MAX_TRANSLATE_WORKERS, len(batches))) as executor:
+                for batch, translated in zip(batches, executor.map(self._translate_batch, batches)):
+                    results.update(zip(batch, translated))
+        return [results[t] if t else "" for t in texts]
+
+    def translate_to_korean(self, text: str) -> str:
+        return self.translate_many([text])[0]
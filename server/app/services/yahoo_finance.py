@@ -1,25 +1,64 @@
 import yfinance as yf
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
+from zoneinfo import ZoneInfo
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+import threading
 from pykrx import stock
+from .market_lookup import market_ticker_name
+from .file_cache import FileCache
+from ..config import Settings
 
 logger = logging.getLogger(__name__)
 
+# 주가 비교 시 한 번의 yf.download에 담을 티커 수와 동시에 보낼 최대 요청 수
+_COMPARISON_CHUNK_SIZE = 20
+_COMPARISON_MAX_WORKERS = 8
+
+# 거래소 기준 날짜 계산용 시간대 (국내 종목 외에는 미국 장 기준으로 판단하며, 그 외 주요 거래소의 날짜보다 늦거나 같음)
+_KST = ZoneInfo("Asia/Seoul")
+_US_EASTERN = ZoneInfo("America/New_York")
+
+def _exchange_today(symbol: str) -> date:
+    """종목이 거래되는 시장의 현재 날짜 (서버 시간대와 무관하게 장중인 날을 판별)"""
+    tz = _KST if symbol.endswith((".KS", ".KQ")) else _US_EASTERN
+    return datetime.now(tz).date()
+
 class YahooFinanceService:
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        # 재무제표·과거 주가는 자주 바뀌지 않으므로 디스크에 캐시해 재시작 후에도 Yahoo 호출을 생략
+        self.cache = FileCache(
+            settings.YFS_CACHE_DIR,
+            max_entries=settings.YFS_CACHE_MAX_ENTRIES,
+            max_age=max(settings.FINANCIALS_CACHE_TTL_SECONDS, settings.PRICE_HISTORY_CACHE_TTL_SECONDS),
+        )
+        # 한 요청 흐름에서 같은 종목의 Ticker를 여러 번 만들지 않도록 짧게 재사용
+        # (Ticker는 info 등을 인스턴스에 보관하므로 info 캐시와 같은 TTL로 만료시켜 오래된 값을 막음)
+        self._tickers = TTLCache(maxsize=256, ttl=settings.INFO_CACHE_TTL_SECONDS)
+        self._tickers_lock = threading.Lock()
+
+    def _ticker(self, symbol: str) -> yf.Ticker:
+        with self._tickers_lock:
+            ticker = self._tickers.get(symbol)
+            if ticker is None:
+                ticker = self._tickers[symbol] = yf.Ticker(symbol)
+        return ticker
 
     def _get_yfinance_ticker_with_suffix(self, symbol: str) -> yf.Ticker | None:
         try:
-            ticker_ks = yf.Ticker(f"{symbol}.KS")
+            ticker_ks = self._ticker(f"{symbol}.KS")
             if ticker_ks.info.get('regularMarketPrice') is not None: return ticker_ks
-            ticker_kq = yf.Ticker(f"{symbol}.KQ")
+            ticker_kq = self._ticker(f"{symbol}.KQ")
             if ticker_kq.info.get('regularMarketPrice') is not None: return ticker_kq
         except Exception: return None
         return None
 
     def get_kr_stock_info_combined(self, symbol: str) -> dict | None:
         try:
-            krx_info = {"symbol": symbol, "longName": stock.get_market_ticker_name(symbol), "marketCap": stock.get_market_cap(symbol).iloc[-1]['시가총액']}
+            krx_info = {"symbol": symbol, "longName": market_ticker_name(symbol), "marketCap": stock.get_market_cap(symbol).iloc[-1]['시가총액']}
             yfs_ticker = self._get_yfinance_ticker_with_suffix(symbol)
             if yfs_ticker and yfs_ticker.info: krx_info.update(yfs_ticker.info)
             return krx_info
@@ -29,7 +68,7 @@ class YahooFinanceService:
 
     def get_stock_info(self, symbol: str) -> dict | None:
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
             info = ticker.info
             if not info or info.get('symbol', '').upper() != symbol.upper():
                  logger.warning(f"yfinance: '{symbol}'에 대한 정보를 찾을 수 없거나 Ticker가 일치하지 않습니다.")
@@ -40,13 +79,20 @@ class YahooFinanceService:
             return None
 
     def get_financials(self, symbol: str) -> dict | None:
-        yfs_ticker = self._get_yfinance_ticker_with_suffix(symbol) if (len(symbol) == 6 and symbol.isdigit()) else yf.Ticker(symbol)
+        cached = self.cache.get('financials', (symbol,), self.settings.FINANCIALS_CACHE_TTL_SECONDS)
+        if cached is not None:
+            return cached
+
+        yfs_ticker = self._get_yfinance_ticker_with_suffix(symbol) if (len(symbol) == 6 and symbol.isdigit()) else self._ticker(symbol)
         if not yfs_ticker: return None
         
         try:
-            income = yfs_ticker.financials
-            balance = yfs_ticker.balance_sheet
-            cashflow = yfs_ticker.cashflow
+            # 세 재무제표는 각각 별도의 HTTP 요청이므로 동시에 조회
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                income_future = executor.submit(lambda: yfs_ticker.financials)
+                balance_future = executor.submit(lambda: yfs_ticker.balance_sheet)
+                cashflow_future = executor.submit(lambda: yfs_ticker.cashflow)
+                income, balance, cashflow = income_future.result(), balance_future.result(), cashflow_future.result()
 
             if all(df is None or df.empty for df in [income, balance, cashflow]):
                 logger.warning(f"yfinance: '{symbol}'에 대한 재무제표 데이터가 모두 비어있습니다.")
@@ -60,38 +106,64 @@ class YahooFinanceService:
                 balance = balance[balance.columns[::-1]]
                 balance = balance.drop(items_to_exclude, errors='ignore')
 
-            return {'income': income, 'balance': balance, 'cashflow': cashflow}
+            financials = {'income': income, 'balance': balance, 'cashflow': cashflow}
+            self.cache.set('financials', (symbol,), financials)
+            return financials
         except Exception as e:
             logger.error(f"yfinance: '{symbol}' 재무제표 조회 중 예외 발생: {e}", exc_info=True)
             return None
             
     def get_price_history(self, symbol: str, start: str, end: str) -> tuple[pd.DataFrame | None, str | None]:
         try:
-            df = yf.download(symbol, start=start, end=end, progress=False, auto_adjust=True)
+            end_dt = datetime.strptime(end, "%Y-%m-%d")
+            # 종료일이 거래소 날짜로 지난 기간의 주가는 더 이상 바뀌지 않으므로 그 경우에만 캐시 사용
+            # (서버 날짜로 판단하면 KST 서버에서 아직 진행 중인 미국 장의 미완성 봉이 캐시됨)
+            cacheable = end_dt.date() < _exchange_today(symbol)
+            cache_key = (symbol, start, end)
+            if cacheable:
+                cached = self.cache.get('price_history', cache_key, self.settings.PRICE_HISTORY_CACHE_TTL_SECONDS)
+                if cached is not None:
+                    return cached
+
+            # yfinance의 end는 해당 날짜를 포함하지 않으므로 하루를 더해 한 번의 요청으로 종료일까지 조회
+            end_inclusive = (end_dt + timedelta(days=1)).strftime("%Y-%m-%d")
+            df = yf.download(symbol, start=start, end=end_inclusive, progress=False, auto_adjust=True)
             if df.empty: return None, None
             df.reset_index(inplace=True)
             df.rename(columns={'Date': 'Date', 'Open': 'Open', 'High': 'High', 'Low': 'Low', 'Close': 'Close', 'Volume': 'Volume'}, inplace=True)
-            return df, df['Date'].max().strftime("%Y-%m-%d")
+            result = (df, df['Date'].max().strftime("%Y-%m-%d"))
+            if cacheable:
+                self.cache.set('price_history', cache_key, result)
+            return result
         except Exception as e:
             logger.error(f"yfinance: '{symbol}' 가격 조회 중 예외 발생: {e}", exc_info=True)
             return None, None
     
-    def get_officers(self, symbol: str) -> list | None:
-        info = self.get_stock_info(symbol)
-        if info:
-            officers = info.get("companyOfficers")
-            return officers
-        return None
-    
+    def _download_close(self, tickers: list, start: str, end: str) -> pd.DataFrame | None:
+        """티커 묶음의 종가를 한 번의 yf.download로 조회 (열 = 티커)"""
+        # 묶음 단위 병렬화는 호출하는 쪽 executor가 담당하므로 yfinance 내부 스레드는 끔 (스레드 중첩 방지)
+        data = yf.download(tickers, start=start, end=end, progress=False, auto_adjust=True, threads=False)
+        if data.empty or 'Close' not in data:
+            return None
+        close_prices = data['Close']
+        if isinstance(close_prices, pd.Series):
+            close_prices = close_prices.to_frame(name=tickers[0])
+        return close_prices
+
     def get_comparison_data(self, tickers: list, start: str, end: str) -> pd.DataFrame | None:
         try:
-            data = yf.download(tickers, start=start, end=end, progress=False, auto_adjust=True)
-            if data.empty or 'Close' not in data:
+            # Yahoo는 한 요청에 담을 수 있는 심볼 수가 제한되므로 묶음으로 나누어 병렬 조회
+            chunks = [tickers[i:i + _COMPARISON_CHUNK_SIZE] for i in range(0, len(tickers), _COMPARISON_CHUNK_SIZE)]
+            if len(chunks) == 1:
+                frames = [self._download_close(chunks[0], start, end)]
+            else:
+                with ThreadPoolExecutor(max_workers=min(_COMPARISON_MAX_WORKERS, len(chunks))) as executor:
+                    frames = list(executor.map(lambda c: self._download_close(c, start, end), chunks))
+            frames = [f for f in frames if f is not None]
+            if not frames:
                 return None
-            close_prices = data['Close']
-            if isinstance(close_prices, pd.Series):
-                close_prices = close_prices.to_frame(name=tickers[0])
-            close_prices.dropna(axis=1, how='all', inplace=True)
+            close_prices = frames[0] if len(frames) == 1 else pd.concat(frames, axis=1)
+            close_prices = close_prices.dropna(axis=1, how='all')
             if close_prices.empty:
                  return None
             first_valid_prices = close_prices.bfill().iloc[0]
@@ -99,4 +171,4 @@ class YahooFinanceService:
             return normalized_prices
         except Exception as e:
             logger.error(f"yfinance: 비교 데이터 처리 중 예외 발생: {e}", exc_info=True)
-            return None
\ No newline at end of file
+            return None
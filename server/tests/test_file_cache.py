@@ -0,0 +1,55 @@
+import os
+import tempfile
+import time
+import unittest
+
+from app.services.file_cache import FileCache
+
+
+def _pkl_files(root):
+    return [os.path.join(d, f) for d, _, files in os.walk(root) for f in files if f.endswith('.pkl')]
+
+
+class FileCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_expired_read_keeps_file_for_longer_ttl(self):
+        cache = FileCache(self.root)
+        cache.set('ns', ('a',), 1)
+        path = cache._path('ns', ('a',))
+        os.utime(path, (0, time.time() - 100))
+        # 메모리 계층을 비워 디스크에서 읽도록 함 (재시작 직후와 같은 상태)
+        cache._memory.clear()
+        self.assertIsNone(cache.get('ns', ('a',), ttl=10))
+        # 짧은 TTL로 만료 판정된 뒤에도 더 긴 TTL로는 다시 읽을 수 있어야 함
+        self.assertEqual(cache.get('ns', ('a',), ttl=1000), 1)
+
+    def test_entries_past_max_age_are_pruned(self):
+        cache = FileCache(self.root, max_age=50)
+        cache.set('ns', ('old',), 1)
+        old_path = cache._path('ns', ('old',))
+        os.utime(old_path, (0, time.time() - 100))
+        cache.set('ns', ('new',), 2)
+        self.assertFalse(os.path.exists(old_path))
+        self.assertTrue(os.path.exists(cache._path('ns', ('new',))))
+
+    def test_oldest_entries_are_evicted_over_cap(self):
+        cache = FileCache(self.root, max_entries=3)
+        now = time.time()
+        for i in range(5):
+            cache.set('ns', (i,), i)
+            os.utime(cache._path('ns', (i,)), (0, now - 100 + i))
+        cache.set('other', ('x',), 'x')
+        remaining = set(_pkl_files(self.root))
+        self.assertEqual(len(remaining), 3)
+        self.assertNotIn(cache._path('ns', (0,)), remaining)
+        self.assertIn(cache._path('other', ('x',)), remaining)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app.core.formatting import price_history_records
+
+
+class PriceHistoryRecordsTest(unittest.TestCase):
+    def test_columns_follow_response_schema_types(self):
+        df = pd.DataFrame({
+            'Date': pd.to_datetime(['2024-01-02', '2024-01-03']),
+            'Open': [1, 2], 'High': [1.5, 2.5], 'Low': [1, 2], 'Close': [1, 2],
+            'Volume': [1234.0, np.nan],
+        })
+        records = price_history_records(df)
+        self.assertEqual(records[0], {'Date': '2024-01-02', 'Close': 1.0, 'High': 1.5, 'Low': 1.0, 'Open': 1.0, 'Volume': 1234})
+        self.assertIsInstance(records[0]['Close'], float)
+        self.assertIsInstance(records[0]['Volume'], int)
+        # 결측 거래량은 null 대신 0
+        self.assertEqual(records[1]['Volume'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+
+import httpx
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from app import main
+from app.services.file_cache import FileCache
+
+
+class FxBreakerTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._orig_file_cache = main.fx_file_cache
+        main.fx_file_cache = FileCache(self._tmp.name, memory_size=4)
+        main.exchange_rate_cache.clear()
+        main._fx_failures = 0
+        main._fx_breaker_open_until = 0.0
+        self.calls = 0
+        self.fail = True
+
+        def handler(request):
+            self.calls += 1
+            if self.fail:
+                return httpx.Response(500)
+            return httpx.Response(200, json={"rates": {"KRW": 1390.0}})
+
+        self.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await self.http.aclose()
+
+    def tearDown(self):
+        main.fx_file_cache = self._orig_file_cache
+        main._fx_failures = 0
+        main._fx_breaker_open_until = 0.0
+        self._tmp.cleanup()
+
+    async def _fetch(self):
+        return await main._fetch_exchange_rate(self.http, main.settings)
+
+    async def test_failed_probe_reopens_immediately(self):
+        for _ in range(main._FX_BREAKER_MAX_FAILURES):
+            with self.assertRaises(httpx.HTTPStatusError):
+                await self._fetch()
+        self.assertGreater(main._fx_breaker_open_until, 0)
+
+        # 대기 시간이 지난 뒤 시험 호출 한 번이 실패하면 다시 차단
+        main._fx_breaker_open_until = 0.0
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self._fetch()
+        self.assertGreater(main._fx_breaker_open_until, 0)
+        self.assertEqual(self.calls, main._FX_BREAKER_MAX_FAILURES + 1)
+
+    async def test_successful_probe_closes_breaker(self):
+        main._fx_failures = main._FX_BREAKER_MAX_FAILURES
+        self.fail = False
+        self.assertEqual(await self._fetch(), 1390.0)
+        self.assertEqual(main._fx_failures, 0)
+        self.assertEqual(main._fx_breaker_open_until, 0.0)
+
+    async def test_restart_uses_stale_disk_rate_when_api_is_down(self):
+        # 다른 프로세스가 2시간 전에 저장한 환율만 디스크에 남아 있는 상태
+        main.fx_file_cache.set('usd_krw', main._FX_CACHE_KEY, (1400.0, time.time() - 7200))
+        path = main.fx_file_cache._path('usd_krw', main._FX_CACHE_KEY)
+        two_hours_ago = time.time() - 7200
+        os.utime(path, (two_hours_ago, two_hours_ago))
+        main.fx_file_cache = FileCache(self._tmp.name, memory_size=4, max_age=main._FX_STALE_MAX_SECONDS)
+
+        request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(http=self.http)))
+        rate = await main.get_exchange_rate(request, main.settings)
+        self.assertEqual(rate, 1400.0)
+        self.assertEqual(self.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
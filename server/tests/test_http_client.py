@@ -0,0 +1,52 @@
+import asyncio
+import os
+import unittest
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from app.main import create_http_client
+
+
+class SharedHttpClientTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f'http://127.0.0.1:{port}/'
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            # keep-alive 연결에서 요청을 계속 받아 응답
+            while await reader.readuntil(b'\r\n\r\n'):
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                await asyncio.sleep(0.02)
+                self.in_flight -= 1
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok')
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def test_connection_limits_apply_with_custom_transport(self):
+        client = create_http_client()
+        try:
+            responses = await asyncio.gather(*(client.get(self.url) for _ in range(12)))
+        finally:
+            await client.aclose()
+        self.assertTrue(all(r.status_code == 200 for r in responses))
+        # 동시 연결은 4개로 제한되고, 그 연결을 재사용해 나머지 요청을 처리
+        self.assertEqual(self.peak_in_flight, 4)
+        self.assertEqual(self.connections, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
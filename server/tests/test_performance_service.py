@@ -0,0 +1,25 @@
+import unittest
+
+import numpy as np
+
+from app.services.performance_service import _smallest_k
+
+
+class SmallestKTest(unittest.TestCase):
+    def test_ties_are_selected_and_ordered_by_row(self):
+        values = np.array([1.0] * 30 + [0.5, 2.0] + [1.0] * 30)
+        idx = _smallest_k(values, 5)
+        self.assertEqual(idx.tolist(), [30, 0, 1, 2, 3])
+
+    def test_matches_stable_full_sort(self):
+        rng = np.random.default_rng(0)
+        values = rng.integers(0, 5, size=500).astype(float)
+        for k in (1, 7, 100, 500, 600):
+            expected = np.argsort(values, kind='stable')[:k]
+            self.assertEqual(_smallest_k(values, k).tolist(), expected.tolist())
+            expected_top = np.argsort(-values, kind='stable')[:k]
+            self.assertEqual(_smallest_k(-values, k).tolist(), expected_top.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import asyncio
+import unittest
+
+from app.core.single_flight import KeyedLocks
+
+
+class KeyedLocksTest(unittest.IsolatedAsyncioTestCase):
+    async def test_serializes_same_key_and_releases_lock(self):
+        locks = KeyedLocks()
+        order = []
+
+        async def worker(name):
+            async with locks.hold('AAPL'):
+                order.append(f'{name}-in')
+                await asyncio.sleep(0.01)
+                order.append(f'{name}-out')
+
+        await asyncio.gather(worker('a'), worker('b'))
+        self.assertEqual(order, ['a-in', 'a-out', 'b-in', 'b-out'])
+        self.assertEqual(len(locks), 0)
+
+    async def test_cancelled_waiter_does_not_leak(self):
+        locks = KeyedLocks()
+        async with locks.hold('AAPL'):
+            waiter = asyncio.create_task(self._enter(locks, 'AAPL'))
+            await asyncio.sleep(0)
+            self.assertEqual(len(locks), 1)
+            waiter.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+        self.assertEqual(len(locks), 0)
+
+    @staticmethod
+    async def _enter(locks, key):
+        async with locks.hold(key):
+            pass
+
+
+if __name__ == '__main__':
+    unittest.main()